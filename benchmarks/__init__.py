@@ -0,0 +1 @@
+"""Reproducible benchmarks for the puzzle solvers (run with: python -m benchmarks.run)"""
@@ -0,0 +1,60 @@
+"""Measure how long importing the solver core takes
+
+Each run imports the module in a fresh interpreter with -X importtime and
+keeps the fastest of several runs. The standard library modules the core
+needs are counted too, so this is what a worker or service pays on startup.
+Fails if the time is over budget or the import pulls in the GUI libraries.
+
+    python -m benchmarks.import_time --module npuzzle.core --budget 20
+"""
+import argparse
+import subprocess
+import sys
+
+# Modules the core must never load
+FORBIDDEN = ("pygame", "PIL", "numpy")
+
+
+def import_profile(module):
+    """Return {module name: cumulative microseconds} for everything one fresh import of `module` loads"""
+    output = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, check=True).stderr
+    entries = []  # (name, cumulative, nesting depth) in report order, children before their parent
+    for line in output.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            name = parts[2].rstrip()
+            entries.append((name.strip(), int(parts[1]), len(name) - len(name.lstrip())))
+    # The imports of `module` are the nested entries right above its own, unnested one
+    end = max(i for i, (name, _, depth) in enumerate(entries) if name == module and depth <= 1)
+    start = end
+    while start > 0 and entries[start - 1][2] > entries[end][2]:
+        start -= 1
+    return {name: cumulative for name, cumulative, _ in entries[start:end + 1]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.import_time", description=__doc__.split("\n")[0])
+    parser.add_argument("--module", default="npuzzle.core")
+    parser.add_argument("--runs", type=int, default=7, help="imports to run, the fastest counts (default: 7)")
+    parser.add_argument("--budget", type=float, default=20, help="milliseconds allowed (default: 20)")
+    args = parser.parse_args(argv)
+
+    profiles = [import_profile(args.module) for _ in range(args.runs)]
+    fastest = min(profiles, key=lambda times: times[args.module])
+    total = fastest[args.module] / 1000
+    print(f"import {args.module}: {total:.1f} ms (fastest of {args.runs})")
+    for name, time in sorted(fastest.items(), key=lambda item: -item[1])[1:11]:
+        print(f"  {time / 1000:6.1f} ms  {name}")
+    loaded = sorted({name.split(".")[0] for name in fastest} & set(FORBIDDEN))
+    if loaded:
+        print(f"{args.module} imports {', '.join(loaded)}")
+        return 1
+    if total > args.budget:
+        print(f"Over the budget of {args.budget:g} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+"""Benchmark instance sets
+
+Every set is a list of (name, board, grid_size, optimal_length) tuples;
+optimal_length is None when it is not known in advance.
+"""
+import os
+
+from npuzzle.generator import generate_boards
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+def read_instances(filename):
+    """Yield the number rows of a data file, skipping comments and blank lines"""
+    with open(os.path.join(DATA_DIR, filename)) as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                yield [int(v) for v in line.split()]
+
+
+def eight_puzzle():
+    """One 3x3 board for every optimal length from 1 to 31"""
+    return [(f"3x3-d{row[-1]}", row[:-1], 3, row[-1]) for row in read_instances("eight_puzzle.txt")]
+
+
+def korf100():
+    """Korf's 100 15-puzzle instances with their optimal lengths
+
+    The file keeps Korf's convention (0 is the blank, solved with the blank
+    first). Rotating the board half a turn and renumbering tile v as 15 - v
+    maps that goal onto ours without changing any distance.
+    """
+    instances = []
+    for number, row in enumerate(read_instances("korf100.txt"), 1):
+        cells, length = row[:16], row[16]
+        board = [0] * 16
+        for index, value in enumerate(cells):
+            board[15 - index] = -1 if value == 0 else 15 - value
+        instances.append((f"korf-{number}", board, 4, length))
+    return instances
+
+
+def random_instances(grid_size, count, seed=0):
+    """`count` random solvable boards, the same for the same seed"""
+    return [(f"{grid_size}x{grid_size}-s{seed}-{i}", board, grid_size, None)
+            for i, board in enumerate(generate_boards(grid_size, count, seed=seed))]
+
+
+# Instance sets selectable by name from the runner
+SETS = {
+    "8-puzzle": eight_puzzle,
+    "korf100": korf100,
+    "random3": lambda: random_instances(3, 50),
+    "random4": lambda: random_instances(4, 20),
+}
@@ -0,0 +1,120 @@
+"""Load generator for the solver service
+
+Sends POST /solve requests from a number of concurrent keep-alive
+connections and reports throughput, latency percentiles and the responses
+by status. A share of the requests repeat earlier boards, to exercise the
+service's cache and request coalescing. With --retry, rejected requests are
+sent again after a pause and their latency counts from the first attempt.
+
+    python -m npuzzle.service --port 8765 &
+    python -m benchmarks.load --port 8765 --requests 2000 --concurrency 32 --grid-size 4 --depth 30
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+from npuzzle.generator import generate_boards
+from npuzzle.service import DEFAULT_PORT, percentile
+
+# Seconds before retrying a rejected request, times the attempt number
+RETRY_DELAY = 0.05
+
+
+async def post(reader, writer, path, payload):
+    """Send one request on a keep-alive connection and return (status, response)"""
+    body = json.dumps(payload).encode()
+    writer.write(f"POST {path} HTTP/1.1\r\nHost: solver\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def get(host, port, unix, path):
+    reader, writer = await (asyncio.open_unix_connection(unix) if unix else asyncio.open_connection(host, port))
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: solver\r\nConnection: close\r\n\r\n".encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return json.loads(response.split(b"\r\n\r\n", 1)[1])
+
+
+async def run_load(args, boards):
+    queue = asyncio.Queue()
+    for board in boards:
+        queue.put_nowait(board)
+    latencies = []
+    statuses = {}
+
+    async def client():
+        if args.unix:
+            reader, writer = await asyncio.open_unix_connection(args.unix)
+        else:
+            reader, writer = await asyncio.open_connection(args.host, args.port)
+        try:
+            while not queue.empty():
+                board = queue.get_nowait()
+                start = time.perf_counter()
+                for attempt in range(1, args.retry + 2):
+                    status, _ = await post(reader, writer, "/solve", {"board": board, "solver": args.solver,
+                                                                      "timeout": args.timeout})
+                    if status != 503 or attempt > args.retry:
+                        break
+                    await asyncio.sleep(RETRY_DELAY * attempt)  # Back off while the service is full
+                latencies.append(time.perf_counter() - start)
+                statuses[status] = statuses.get(status, 0) + 1
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    print(f"{len(latencies)} requests in {elapsed:.2f}s from {args.concurrency} connections: "
+          f"{len(latencies) / elapsed:.1f} requests/s")
+    print("latency " + "  ".join(f"{name} {percentile(latencies, fraction) * 1000:.1f} ms"
+                                 for name, fraction in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("max", 1))))
+    print("responses " + ", ".join(f"{count} x {status}" for status, count in sorted(statuses.items())))
+    metrics = await get(args.host, args.port, args.unix, "/metrics")
+    print(f"service: {metrics['solves']} solves, {metrics['cache_hits']} cache hits, "
+          f"{metrics['coalesced']} coalesced, {metrics['rejected']} rejected")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load", description=__doc__.split("\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", help="connect to this Unix socket instead")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=16, help="connections sending requests at once")
+    parser.add_argument("--grid-size", type=int, default=4)
+    parser.add_argument("--depth", type=int, default=30, help="moves from the goal of the boards (default: 30)")
+    parser.add_argument("--repeat", type=float, default=0.5, help="share of requests for a board already sent")
+    parser.add_argument("--solver", default="A*")
+    parser.add_argument("--timeout", type=float, default=30, help="deadline sent with every request")
+    parser.add_argument("--retry", type=int, default=0,
+                        help="times to resend a request rejected with 503, backing off in between (default: 0)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    unique = generate_boards(args.grid_size, max(1, round(args.requests * (1 - args.repeat))), args.depth, args.seed)
+    boards = unique + [rng.choice(unique) for _ in range(args.requests - len(unique))]
+    rng.shuffle(boards)
+    asyncio.run(run_load(args, boards))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""Measure how parallel IDA* speeds up with the number of cores
+
+Every instance is solved once with serial IDA* and once per worker count
+with parallel IDA*, all with the same heuristic; the totals give the speedup
+over the serial search and the parallel efficiency (speedup per core).
+
+    python -m benchmarks.parallel --set korf100 --limit 10 --heuristic pdb --workers 1 2 4 8 16
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+from npuzzle.ida_star import ida_star_solve
+from npuzzle.parallel import parallel_ida_star_solve
+from npuzzle.stats import SearchCancelled, SearchStats
+
+from .instances import SETS
+from .run import git_revision, make_heuristic
+
+
+def timed_solve(solve, board, grid_size, heuristic, timeout, **kwargs):
+    """Return (seconds, moves, expanded) for one solve, moves being None on timeout"""
+    stats = SearchStats(time_limit=timeout)
+    start = time.perf_counter()
+    try:
+        moves = solve(board, grid_size, heuristic, stats, **kwargs)
+    except SearchCancelled:
+        moves = None
+    return time.perf_counter() - start, moves, stats.expanded
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.parallel", description=__doc__.split("\n")[0])
+    parser.add_argument("--set", dest="set_name", default="random4", choices=sorted(SETS))
+    parser.add_argument("--limit", type=int, default=5, help="only run the first LIMIT instances (default: 5)")
+    parser.add_argument("--heuristic", default="linear-conflict", choices=("manhattan", "linear-conflict", "pdb"))
+    parser.add_argument("--workers", type=int, nargs="+",
+                        help="worker counts to measure (default: powers of two up to the number of cores)")
+    parser.add_argument("--timeout", type=float, default=300, help="seconds allowed per solve")
+    parser.add_argument("-o", "--output", help="JSON file for the results")
+    args = parser.parse_args(argv)
+
+    cores = os.cpu_count() or 1
+    counts = args.workers or [2 ** i for i in range(cores.bit_length()) if 2 ** i <= cores]
+    instances = SETS[args.set_name]()[:args.limit]
+    results = []
+    for name, board, grid_size, optimal in instances:
+        heuristic = make_heuristic(args.heuristic, grid_size)
+        seconds, moves, expanded = timed_solve(ida_star_solve, board, grid_size, heuristic, args.timeout)
+        if moves is None:
+            print(f"{name:12} serial timed out, skipped", file=sys.stderr)
+            continue
+        result = {"instance": name, "length": len(moves), "serial": {"time": round(seconds, 6), "expanded": expanded},
+                  "parallel": {}}
+        print(f"{name:12} {len(moves)} moves, serial {seconds:.3f}s", file=sys.stderr)
+        for workers in counts:
+            seconds, parallel_moves, expanded = timed_solve(parallel_ida_star_solve, board, grid_size, heuristic,
+                                                            args.timeout, workers=workers)
+            if parallel_moves is not None and len(parallel_moves) != len(moves):
+                sys.exit(f"{name}: parallel IDA* found {len(parallel_moves)} moves instead of {len(moves)}")
+            result["parallel"][workers] = {"time": round(seconds, 6), "expanded": expanded,
+                                           "solved": parallel_moves is not None}
+            print(f"{name:12} {workers:3} workers {seconds:.3f}s", file=sys.stderr)
+        results.append(result)
+
+    serial = sum(r["serial"]["time"] for r in results)
+    summary = {}
+    print(f"{'workers':>8} {'time':>10} {'speedup':>8} {'efficiency':>10}")
+    print(f"{'serial':>8} {serial:10.3f}")
+    for workers in counts:
+        runs = [r["parallel"][workers] for r in results]
+        total = sum(run["time"] for run in runs)
+        speedup = serial / total if total and all(run["solved"] for run in runs) else None
+        summary[workers] = {"time": round(total, 6), "speedup": speedup and round(speedup, 3)}
+        if speedup is None:
+            print(f"{workers:8} {total:10.3f} {'-':>8} {'-':>10}")
+        else:
+            print(f"{workers:8} {total:10.3f} {speedup:8.2f} {speedup / workers:10.0%}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "meta": {
+                    "date": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                    "revision": git_revision(),
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "cores": cores,
+                    "set": args.set_name,
+                    "heuristic": args.heuristic,
+                },
+                "summary": summary,
+                "results": results,
+            }, f, indent=1)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
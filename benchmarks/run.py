@@ -0,0 +1,247 @@
+"""Run the solvers over the benchmark sets and compare with a saved baseline
+
+Every instance is solved in a fresh worker process, so peak memory is
+measured per instance and one search cannot warm caches for the next.
+Results are written as JSON; pass an earlier results file as --baseline to
+flag instances and solvers that got slower or expand more nodes.
+
+    python -m benchmarks.run --set 8-puzzle -o baseline.json
+    python -m benchmarks.run --set 8-puzzle --baseline baseline.json
+"""
+import argparse
+import json
+import multiprocessing
+import platform
+import subprocess
+import sys
+import time
+
+from npuzzle.core import a_star_solve, is_solved, move_tile
+from npuzzle.external import external_solve
+from npuzzle.heuristics import LinearConflictHeuristic, ManhattanHeuristic
+from npuzzle.ida_star import ida_star_solve
+from npuzzle.pdb import load_pattern_database
+from npuzzle.stats import SearchCancelled, SearchStats, TIME_LIMIT_REACHED, peak_rss
+
+from .instances import SETS
+
+# Solver/heuristic combinations, by name
+COMBOS = {
+    "A*/manhattan": ("A*", "manhattan"),
+    "A*/linear-conflict": ("A*", "linear-conflict"),
+    "IDA*/manhattan": ("IDA*", "manhattan"),
+    "IDA*/linear-conflict": ("IDA*", "linear-conflict"),
+    "IDA*/pdb": ("IDA*", "pdb"),
+    "Batched/manhattan": ("Batched", "manhattan"),
+    "Batched/linear-conflict": ("Batched", "linear-conflict"),
+    "External/linear-conflict": ("External", "linear-conflict"),
+}
+
+# Times below this many seconds are too noisy to compare
+MIN_COMPARED_TIME = 0.05
+
+
+def make_heuristic(name, grid_size):
+    if name == "manhattan":
+        return ManhattanHeuristic()
+    if name == "linear-conflict":
+        return LinearConflictHeuristic()
+    if name == "pdb":
+        return load_pattern_database(grid_size)
+    raise ValueError(f"Unknown heuristic {name!r}")
+
+
+def run_instance(task):
+    """Solve one instance with one combination and return its result record"""
+    combo, name, board, grid_size, optimal, timeout, memory_limit, repeat = task
+    solver, heuristic_name = COMBOS[combo]
+    result = {"combo": combo, "instance": name, "grid_size": grid_size}
+    try:
+        if solver == "Batched":
+            from npuzzle.batched import batched_solve  # Needs NumPy
+            heuristic = heuristic_name
+        else:
+            heuristic = make_heuristic(heuristic_name, grid_size)
+    except (ImportError, ValueError, FileNotFoundError) as e:
+        result["status"] = "unavailable"
+        result["error"] = str(e)
+        return result
+
+    # The searches are deterministic, so repeated runs only differ in time
+    best = None
+    for _ in range(repeat):
+        stats = SearchStats(time_limit=timeout, memory_limit=memory_limit)
+        start = time.perf_counter()
+        try:
+            if solver == "A*":
+                moves = a_star_solve(board, None, grid_size, heuristic, stats)
+            elif solver == "Batched":
+                moves = batched_solve(board, grid_size, heuristic, stats)
+            elif solver == "External":
+                moves = external_solve(board, grid_size, heuristic, stats)
+            else:
+                moves = ida_star_solve(board, grid_size, heuristic, stats)
+            result["status"] = "solved"
+        except SearchCancelled:
+            moves = None
+            result["status"] = "timeout" if stats.stop_reason == TIME_LIMIT_REACHED else "out of memory"
+        except MemoryError:
+            moves = None
+            result["status"] = "out of memory"
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        if moves is None:
+            break
+    result["time"] = round(best, 6)
+
+    if moves is not None:
+        result["length"] = len(moves)
+        played = list(board)
+        valid = all(move_tile(played, direction, grid_size) is not None for direction, _ in moves)
+        if not valid or not is_solved(played, grid_size) or (optimal is not None and len(moves) != optimal):
+            result["status"] = "wrong"
+    if optimal is not None:
+        result["optimal"] = optimal
+    result["expanded"] = stats.expanded
+    result["generated"] = stats.generated
+    result["peak_frontier"] = stats.peak_frontier
+    result["peak_rss"] = peak_rss()
+    return result
+
+
+def summarize(results):
+    """Totals per combination over its solved instances"""
+    summary = {}
+    for result in results:
+        entry = summary.setdefault(result["combo"], {
+            "instances": 0, "solved": 0, "time": 0.0, "expanded": 0, "generated": 0,
+            "peak_frontier": 0, "peak_rss": 0,
+        })
+        entry["instances"] += 1
+        if result["status"] != "solved":
+            continue
+        entry["solved"] += 1
+        for key in ("time", "expanded", "generated"):
+            entry[key] += result[key]
+        for key in ("peak_frontier", "peak_rss"):
+            entry[key] = max(entry[key], result[key] or 0)
+    for entry in summary.values():
+        entry["time"] = round(entry["time"], 6)
+    return summary
+
+
+def compare(results, baseline, threshold):
+    """Return the regressions of `results` against a baseline results dict
+
+    An instance regresses when it no longer solves, or when its time or node
+    counts grew by more than `threshold` (a fraction). Combination totals are
+    compared over the instances solved in both runs.
+    """
+    previous = {(r["combo"], r["instance"]): r for r in baseline["results"]}
+    regressions = []
+    totals = {}
+    for result in results:
+        old = previous.get((result["combo"], result["instance"]))
+        if old is None or old["status"] != "solved":
+            continue
+        label = f"{result['combo']} {result['instance']}"
+        if result["status"] != "solved":
+            regressions.append(f"{label}: {result['status']} (was solved)")
+            continue
+        total = totals.setdefault(result["combo"], {"time": [0.0, 0.0], "expanded": [0, 0], "generated": [0, 0]})
+        for key in total:
+            total[key][0] += old[key]
+            total[key][1] += result[key]
+        for key in ("expanded", "generated"):
+            if result[key] > old[key] * (1 + threshold):
+                regressions.append(f"{label}: {key} {old[key]} -> {result[key]}")
+        if max(old["time"], result["time"]) >= MIN_COMPARED_TIME and result["time"] > old["time"] * (1 + threshold):
+            regressions.append(f"{label}: time {old['time']:.3f}s -> {result['time']:.3f}s")
+    for combo, total in totals.items():
+        for key, (before, after) in total.items():
+            if after > before * (1 + threshold) and (key != "time" or after >= MIN_COMPARED_TIME):
+                regressions.append(f"{combo} total: {key} {before:.6g} -> {after:.6g}")
+    return regressions
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.split("\n")[0])
+    parser.add_argument("--set", dest="sets", action="append", choices=sorted(SETS),
+                        help="instance set to run, may be repeated (default: 8-puzzle)")
+    parser.add_argument("--combo", dest="combos", action="append", choices=list(COMBOS),
+                        help="solver/heuristic combination, may be repeated (default: all)")
+    parser.add_argument("--limit", type=int, help="only run the first LIMIT instances of each set")
+    parser.add_argument("--timeout", type=float, default=60, help="seconds allowed per instance")
+    parser.add_argument("--memory-limit", type=float, default=2048, help="resident memory allowed per instance, in MB")
+    parser.add_argument("--repeat", type=int, default=1, help="solve every instance REPEAT times and keep the fastest")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="instances run at once (default: 1, more makes times less comparable)")
+    parser.add_argument("-o", "--output", help="JSON file for the results")
+    parser.add_argument("--baseline", help="results file of an earlier run to compare with")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="relative increase reported as a regression (default: 0.1)")
+    args = parser.parse_args(argv)
+
+    sets = args.sets or ["8-puzzle"]
+    combos = args.combos or list(COMBOS)
+    memory_limit = int(args.memory_limit * 1024 * 1024) if args.memory_limit else None
+    tasks = []
+    for set_name in sets:
+        instances = SETS[set_name]()[:args.limit]
+        for combo in combos:
+            for name, board, grid_size, optimal in instances:
+                tasks.append((combo, name, board, grid_size, optimal, args.timeout, memory_limit, args.repeat))
+
+    results = []
+    # A fresh process per instance keeps peak RSS and caches per instance
+    with multiprocessing.Pool(args.workers, maxtasksperchild=1) as pool:
+        for result in pool.imap(run_instance, tasks):
+            results.append(result)
+            detail = f"{result['time']:.3f}s, {result['expanded']} expanded" if "time" in result else result["error"]
+            print(f"{result['combo']:24} {result['instance']:12} {result['status']:13} {detail}", file=sys.stderr)
+
+    report = {
+        "meta": {
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sets": sets,
+            "timeout": args.timeout,
+            "repeat": args.repeat,
+            "memory_limit": memory_limit,
+        },
+        "summary": summarize(results),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=1)
+
+    for combo, entry in report["summary"].items():
+        print(f"{combo:24} {entry['solved']}/{entry['instances']} solved in {entry['time']:.2f}s, "
+              f"{entry['expanded']} expanded, peak frontier {entry['peak_frontier']}, "
+              f"peak RSS {entry['peak_rss'] / 2**20:.0f} MB")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regressions against {args.baseline}:")
+            for line in regressions:
+                print("  " + line)
+            return 1
+        print(f"No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""Solver engines for the N-Puzzle game
+
+The game rules and solvers, with no pygame or PIL dependency. Everything in
+__all__ is the stable API; submodules are only imported when one of their
+names is first used, so `import npuzzle` stays cheap for workers and tools.
+"""
+from importlib import import_module
+
+# Public name -> submodule defining it
+_EXPORTS = {
+    "SOLVERS": "core",
+    "a_star_solve": "core",
+    "create_solvable_board": "core",
+    "heuristic": "core",
+    "is_solvable": "core",
+    "is_solved": "core",
+    "move_tile": "core",
+    "solve": "core",
+    "anytime_solve": "anytime",
+    "Board": "board",
+    "external_solve": "external",
+    "SolutionCache": "cache",
+    "generate_board": "generator",
+    "generate_boards": "generator",
+    "Heuristic": "heuristics",
+    "LinearConflictHeuristic": "heuristics",
+    "ManhattanHeuristic": "heuristics",
+    "as_heuristic": "heuristics",
+    "ida_star_solve": "ida_star",
+    "parallel_ida_star_solve": "parallel",
+    "PatternDatabase": "pdb",
+    "load_pattern_database": "pdb",
+    "SearchCancelled": "stats",
+    "SearchStats": "stats",
+    "table_distance": "table",
+    "table_solve": "table",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
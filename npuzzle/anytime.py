@@ -0,0 +1,139 @@
+"""Bounded-suboptimal, anytime solving for boards too large to solve optimally
+
+anytime_solve first builds a solution the way a person would, tile by tile
+and row by row (constructive_solve). That takes a few hundredths of a second
+on a 6x6 board whatever the board, which is what keeps the first solution
+under the one second target: weighted A*, even with a high weight, runs for
+seconds on some 6x6 boards. The search is then run with decreasing weights,
+pruned by the length of the best solution so far, until the requested
+suboptimality bound is reached. Every shorter solution is handed to a
+callback as soon as it is found, so the game can start playing the first one
+and switch to better ones on the way.
+"""
+from collections import deque
+
+from .core import a_star_solve
+from .heuristics import as_heuristic
+from .state import OPPOSITE, blank_offset, move_table
+from .stats import SearchCancelled
+
+# Weights tried in turn, from the fastest to the most accurate
+WEIGHTS = (20, 10, 5, 3, 2, 1.5, 1.25, 1)
+
+
+def anytime_solve(initial_board, grid_size, bound=2, heuristic=None, stats=None, found=None):
+    """Return a solution at most `bound` times longer than optimal
+
+    `found(path)` is called with every solution shorter than the previous
+    one. If the search is stopped through `stats` (cancelled or out of
+    budget) the best solution found so far is returned instead of raising
+    SearchCancelled; the stop reason stays available in `stats.stop_reason`.
+    """
+    if bound < 1:
+        raise ValueError("The suboptimality bound must be at least 1")
+    heuristic = as_heuristic(heuristic)
+    # The first solution comes without any bound, the weighted searches then prove one
+    best = constructive_solve(initial_board, grid_size, stats)
+    if not best:
+        return best
+    if found is not None:
+        found(best)
+    for weight in [w for w in WEIGHTS if w > bound] + [bound]:
+        try:
+            path = a_star_solve(initial_board, None, grid_size, heuristic, stats, weight=weight, cost_limit=len(best))
+        except (SearchCancelled, MemoryError):
+            return best
+        if path is not None:
+            best = path
+            if found is not None:
+                found(best)
+    return best
+
+
+def place_tiles(board, grid_size, tiles, locked):
+    """Move `tiles` home without touching the `locked` indices, in as few moves as possible
+
+    Searches breadth-first over the positions of the blank and of `tiles`
+    only, the other tiles being interchangeable, so a few tiles at a time
+    make a small search on any board. `board` is played in place and the
+    moves are returned.
+    """
+    moves = move_table(grid_size)
+    start = (board.index(-1),) + tuple(board.index(tile) for tile in tiles)
+    goal = tuple(tiles)
+    parents = {start: None}
+    queue = deque([start])
+    while queue:
+        state = queue.popleft()
+        if state[1:] == goal:
+            break
+        blank = state[0]
+        for tile_idx, direction in moves[blank]:
+            if tile_idx in locked:
+                continue
+            child = (tile_idx,) + tuple(blank if position == tile_idx else position for position in state[1:])
+            if child not in parents:
+                parents[child] = (state, (direction, tile_idx))
+                queue.append(child)
+    else:
+        raise ValueError("Board is not solvable")
+    path = []
+    while parents[state] is not None:
+        state, move = parents[state]
+        path.append(move)
+    path.reverse()
+    for _, tile_idx in path:
+        blank = board.index(-1)
+        board[blank], board[tile_idx] = board[tile_idx], -1
+    return path
+
+
+def constructive_solve(initial_board, grid_size, stats=None):
+    """Solve a solvable puzzle quickly but far from optimally, returning a list of (direction, moved_tile)
+
+    Rows are completed from the top, their last two tiles together, until
+    two rows are left; those are completed column by column, two tiles at a
+    time, and the last three tiles together. Every step only searches the
+    positions of the tiles it places, so the time hardly depends on the board.
+    `stats` is only checked for cancellation between steps.
+    """
+    n = grid_size
+    steps = []
+    for row in range(n - 2):
+        steps += [[row * n + col] for col in range(n - 2)]
+        steps.append([row * n + n - 2, row * n + n - 1])
+    steps += [[(n - 2) * n + col, (n - 1) * n + col] for col in range(n - 2)]
+    steps.append([(n - 2) * n + n - 2, (n - 2) * n + n - 1, (n - 1) * n + n - 2])
+
+    board = list(initial_board)
+    locked = set()
+    path = []
+    for tiles in steps:
+        if stats is not None:
+            stats.check()
+        path += place_tiles(board, n, tiles, locked)
+        locked.update(tiles)
+    # Steps can meet on a move and its inverse
+    return splice_path([], path, n)
+
+
+def inverse_move(move, grid_size):
+    """The (direction, moved_tile) move that undoes `move`"""
+    direction, moved_tile = move
+    return OPPOSITE[direction], moved_tile - blank_offset(direction, grid_size)
+
+
+def splice_path(played, path, grid_size):
+    """Moves that lead from the board after `played` along `path` to the goal
+
+    Both move lists start from the same board. The result walks back over
+    the played moves and then follows `path`, with every move that is
+    directly undone by the next one cancelled out.
+    """
+    moves = []
+    for move in [inverse_move(m, grid_size) for m in reversed(played)] + list(path):
+        if moves and moves[-1][0] == OPPOSITE[move[0]]:
+            moves.pop()
+        else:
+            moves.append(move)
+    return moves
@@ -0,0 +1,60 @@
+"""Run a solver in a worker thread so the game window keeps responding"""
+import threading
+
+from .stats import SearchStats, SearchCancelled
+
+
+class BackgroundSolver:
+    """Solve one board in a daemon thread
+
+    `solve(board, grid_size, stats, found)` is called with a copy of the
+    board. While it runs, `stats` holds live progress and an anytime solver
+    may call `found(path)` with every improved solution; `best` always holds
+    the latest one and `solutions` counts them, so watchers can tell when it
+    changed. Once `done` is true either `result` holds the solution or `error`
+    says why there is none. `profile` and `callback` go to the SearchStats.
+    """
+
+    def __init__(self, solve, board, grid_size, time_limit=None, memory_limit=None, profile=False, callback=None):
+        self.solve = solve
+        self.board = list(board)
+        self.grid_size = grid_size
+        self.stats = SearchStats(time_limit, memory_limit, profile, callback)
+        self.result = None
+        self.error = None
+        self.best = None
+        self.solutions = 0
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def _run(self):
+        try:
+            self.result = self.solve(self.board, self.grid_size, self.stats, self.found)
+            if self.result is None:
+                self.error = "No solution found"
+            elif self.result != self.best:
+                self.found(self.result)
+        except SearchCancelled as e:
+            self.error = str(e)
+        except MemoryError:
+            self.error = "Out of memory"
+        except Exception as e:  # A broken cache or data file, say: show it rather than die silently
+            self.error = f"Solver failed ({e})"
+        finally:
+            self.stats.finish()
+
+    def found(self, path):
+        """Publish an improved solution"""
+        self.best = list(path)
+        self.solutions += 1
+
+    @property
+    def done(self):
+        return not self.thread.is_alive()
+
+    def cancel(self):
+        """Stop the search; the thread exits at the search's next check"""
+        self.stats.cancel()
@@ -0,0 +1,138 @@
+"""Solve many boards from the command line, without the game window
+
+Input is JSONL ({"board": [...], "grid_size": 3} per line, grid_size and an
+optional "id" may be left out) or CSV (grid size followed by the cells on
+each line). Results are written as JSONL in input order while the boards are
+spread over a pool of worker processes.
+
+    python -m npuzzle.batch boards.jsonl -o results.jsonl --solver 'IDA*' --timeout 30
+"""
+import argparse
+import csv
+import json
+import math
+import multiprocessing
+import os
+import sys
+import time
+
+from .cache import SolutionCache
+from .core import SOLVERS, is_solvable, is_valid_board, solve
+from .stats import SearchStats, SearchCancelled, TIME_LIMIT_REACHED
+
+
+def read_boards(path, fmt=None):
+    """Yield (id, board, grid_size, error) for every line of a JSONL or CSV file
+
+    A line that cannot be read as a board is yielded with None for the
+    board and grid size and a message as `error`, so one bad line does not
+    stop a whole batch.
+    """
+    if fmt is None:
+        fmt = "csv" if path.lower().endswith(".csv") else "jsonl"
+    with open(path, newline="") as f:
+        if fmt == "csv":
+            for row in csv.reader(f):
+                if not row or not row[0].strip().lstrip("-").isdigit():
+                    continue  # Blank or header line
+                try:
+                    values = [int(v) for v in row if v.strip()]
+                except ValueError as e:
+                    yield None, None, None, f"Bad CSV row ({e})"
+                    continue
+                yield None, values[1:], values[0], None
+        else:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    yield None, None, None, f"Bad JSON ({e})"
+                    continue
+                if not isinstance(record, dict) or not isinstance(record.get("board"), list):
+                    yield None, None, None, "Expected an object with a 'board' list"
+                    continue
+                board = record["board"]
+                grid_size = record.get("grid_size") or math.isqrt(len(board))
+                yield record.get("id"), board, grid_size, None
+
+
+def solve_record(task):
+    """Solve one board in a worker process and return its result record"""
+    index, board_id, board, grid_size, error, solver, bound, timeout, memory_limit, cache_path, profile = task
+    if error is not None:
+        return {"index": index, "status": "invalid", "error": error}
+    result = {"index": index, "grid_size": grid_size, "board": board}
+    if board_id is not None:
+        result["id"] = board_id
+    if not is_valid_board(board, grid_size):
+        result["status"] = "invalid"
+        return result
+    if not is_solvable(board, grid_size):
+        result["status"] = "unsolvable"
+        return result
+
+    stats = SearchStats(time_limit=timeout, memory_limit=memory_limit, profile=profile)
+    try:
+        cache = SolutionCache(cache_path) if cache_path else None
+        moves = solve(board, grid_size, solver, stats, bound, cache=cache)
+        result["status"] = "solved"
+        result["moves"] = [list(move) for move in moves]
+        result["length"] = len(moves)
+    except SearchCancelled:
+        result["status"] = "timeout" if stats.stop_reason == TIME_LIMIT_REACHED else "out of memory"
+    except MemoryError:
+        result["status"] = "out of memory"
+    except Exception as e:  # A broken cache file, say: report it with this board rather than end the batch
+        result["status"] = "error"
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["expanded"] = stats.expanded
+    result["generated"] = stats.generated
+    result["duplicates"] = stats.duplicates
+    result["time"] = round(stats.elapsed, 6)
+    if profile:
+        result["stats"] = stats.to_dict()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m npuzzle.batch", description=__doc__.split("\n")[0])
+    parser.add_argument("input", help="JSONL or CSV file with one board per line")
+    parser.add_argument("-o", "--output", help="JSONL file for the results (default: stdout)")
+    parser.add_argument("--format", choices=("jsonl", "csv"), help="input format (default: from the file extension)")
+    parser.add_argument("--solver", default="IDA*", choices=SOLVERS)
+    parser.add_argument("--bound", type=float, default=2,
+                        help="suboptimality bound of the Fast solver (default: 2)")
+    parser.add_argument("--timeout", type=float, default=60, help="seconds allowed per board")
+    parser.add_argument("--memory-limit", type=float, help="resident memory allowed per worker, in MB")
+    parser.add_argument("--cache", help="SQLite file of solutions to reuse and extend")
+    parser.add_argument("--profile", action="store_true",
+                        help="time the search phases and add the full search statistics to every result")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes (default: all cores)")
+    args = parser.parse_args(argv)
+
+    memory_limit = int(args.memory_limit * 1024 * 1024) if args.memory_limit else None
+    tasks = ((index, board_id, board, grid_size, error, args.solver, args.bound, args.timeout, memory_limit, args.cache,
+              args.profile)
+             for index, (board_id, board, grid_size, error) in enumerate(read_boards(args.input, args.format)))
+    output = open(args.output, "w") if args.output else sys.stdout
+    start = time.monotonic()
+    counts = {}
+    try:
+        with multiprocessing.Pool(args.workers) as pool:
+            # imap hands results back in input order as soon as they are ready
+            for result in pool.imap(solve_record, tasks):
+                output.write(json.dumps(result) + "\n")
+                output.flush()
+                counts[result["status"]] = counts.get(result["status"], 0) + 1
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    summary = ", ".join(f"{count} {status}" for status, count in sorted(counts.items()))
+    print(f"{sum(counts.values())} boards in {time.monotonic() - start:.1f}s: {summary or 'none'}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
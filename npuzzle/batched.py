@@ -0,0 +1,239 @@
+"""Breadth-first heuristic search on NumPy arrays of packed boards
+
+Instead of expanding one node at a time, the search expands a whole layer
+of the search tree at once. A layer is an array of boards packed into
+uint64 keys (4 bits per cell, so up to 4x4), and every step of an expansion
+- making the children through precomputed move tables, evaluating the
+heuristic, pruning, removing duplicates - is a handful of array operations
+over the whole layer.
+
+The search is breadth-first with an f-bound, like IDA* but layer by layer
+(breadth-first iterative deepening): children with g + h above the bound are
+dropped, and the bound is raised to the smallest dropped f until the goal
+turns up. Since the puzzle graph is undirected and bipartite, a child can
+only duplicate a board in its own layer or two layers up, so those are the
+only layers it is checked against (by binary search in the sorted layer).
+Every layer keeps the move that reached each board, which is enough to walk
+back from the goal once it is found.
+
+NumPy is only needed for this solver: import this module lazily.
+"""
+from contextlib import nullcontext
+from functools import lru_cache
+
+import numpy as np
+
+from .heuristics import line_conflict, manhattan_table
+from .state import DIRECTIONS, blank_offset, cell_bits, goal_state, pack_board, slide
+from .stats import CHECK_INTERVAL
+
+# Largest grid whose packed boards fit in a uint64
+MAX_GRID_SIZE = 4
+
+# Boards expanded between two budget checks
+CHUNK_SIZE = 64 * CHECK_INTERVAL
+
+HEURISTICS = ("manhattan", "linear-conflict")
+
+
+class Tables:
+    """Lookup tables shared by every search on boards of one size"""
+
+    def __init__(self, grid_size):
+        n = self.grid_size = grid_size
+        cells = n * n
+        blank_code = cells - 1
+        bits = cell_bits(n)
+        self.shifts = np.arange(cells, dtype=np.uint64) * np.uint64(bits)
+        self.mask = np.uint64((1 << bits) - 1)
+        # moves[blank, d]: index of the tile that moves for direction d, or -1
+        self.moves = np.full((cells, len(DIRECTIONS)), -1, dtype=np.int64)
+        for blank in range(cells):
+            row, col = blank // n, blank % n
+            for d, (direction, ok) in enumerate(zip(DIRECTIONS, (row < n - 1, row > 0, col < n - 1, col > 0))):
+                if ok:
+                    self.moves[blank, d] = blank + blank_offset(direction, n)
+        # distance[code, index]: Manhattan distance of a tile code at an index (0 for the blank)
+        self.distance = np.zeros((cells, cells), dtype=np.int64)
+        self.distance[:blank_code] = manhattan_table(n)
+        # Goal row and column of every tile code, -1 for the blank (and codes
+        # that the cell bits can hold but no tile uses)
+        self.goal_row = np.array([t // n for t in range(blank_code)] + [-1] * ((1 << bits) - blank_code))
+        self.goal_col = np.array([t % n for t in range(blank_code)] + [-1] * ((1 << bits) - blank_code))
+        # conflicts[code]: linear conflicts of a line whose cells hold the digits
+        # of `code` in base n + 1 (0 for a tile from another line, else goal offset + 1)
+        self.conflicts = np.zeros((n + 1) ** n, dtype=np.int64)
+        for code in range(len(self.conflicts)):
+            digits = [code // (n + 1) ** i % (n + 1) for i in range(n)]
+            self.conflicts[code] = line_conflict(tuple(d - 1 for d in digits if d))
+        self.powers = np.array([(n + 1) ** i for i in range(n)])
+        # row_conflicts[r, bits]: linear conflicts of row r when its cells,
+        # packed like a board, read `bits`; the same for columns
+        lines = np.arange(1 << (bits * n), dtype=np.uint64)
+        codes = ((lines[:, None] >> self.shifts[None, :n]) & self.mask).astype(np.intp)
+        rows, cols = self.goal_row[codes], self.goal_col[codes]
+        self.row_conflicts = np.stack([self.conflicts[np.where(rows == r, cols + 1, 0) @ self.powers]
+                                       for r in range(n)])
+        self.col_conflicts = np.stack([self.conflicts[np.where(cols == c, rows + 1, 0) @ self.powers]
+                                       for c in range(n)])
+
+    def row_bits(self, keys, rows):
+        """The packed cells of one row of each board"""
+        width = np.uint64(cell_bits(self.grid_size) * self.grid_size)
+        return (keys >> (rows.astype(np.uint64) * width)) & ((np.uint64(1) << width) - np.uint64(1))
+
+    def col_bits(self, keys, cols):
+        """The packed cells of one column of each board, packed like a row"""
+        n = self.grid_size
+        bits = np.uint64(cell_bits(n))
+        cols = cols.astype(np.uint64)
+        line = np.zeros_like(keys)
+        for i in range(n):
+            line |= ((keys >> ((cols + np.uint64(i * n)) * bits)) & self.mask) << np.uint64(i * bits)
+        return line
+
+
+@lru_cache(maxsize=None)
+def tables(grid_size):
+    return Tables(grid_size)
+
+
+def unpack_boards(keys, grid_size):
+    """2-D array of tile codes (blank = grid_size**2 - 1), one row per packed board"""
+    t = tables(grid_size)
+    return ((keys[:, None] >> t.shifts[None, :]) & t.mask).astype(np.intp)
+
+
+def manhattan_batch(boards, grid_size):
+    """Manhattan distance of every row of an unpacked board array"""
+    return tables(grid_size).distance[boards, np.arange(boards.shape[1])].sum(axis=1)
+
+
+def linear_conflict_batch(boards, grid_size):
+    """Manhattan distance plus linear conflicts of every row of an unpacked board array"""
+    n = grid_size
+    t = tables(n)
+    total = manhattan_batch(boards, n)
+    rows, cols = t.goal_row[boards], t.goal_col[boards]
+    for line in range(n):
+        row = np.s_[:, line * n:line * n + n]
+        total += t.conflicts[np.where(rows[row] == line, cols[row] + 1, 0) @ t.powers]
+        col = np.s_[:, line::n]
+        total += t.conflicts[np.where(cols[col] == line, rows[col] + 1, 0) @ t.powers]
+    return total
+
+
+def batched_solve(initial_board, grid_size, heuristic="linear-conflict", stats=None):
+    """Solve a solvable puzzle optimally, returning a list of (direction, moved_tile)
+
+    `heuristic` is "manhattan" or "linear-conflict". Boards up to 4x4 only.
+    A SearchStats passed as `stats` receives progress and can stop the search.
+    """
+    if grid_size > MAX_GRID_SIZE:
+        raise ValueError(f"Batched search supports boards up to {MAX_GRID_SIZE}x{MAX_GRID_SIZE}")
+    if heuristic not in HEURISTICS:
+        raise ValueError(f"Unknown heuristic {heuristic!r}, expected one of {HEURISTICS}")
+    conflicts = heuristic == "linear-conflict"
+    n = grid_size
+    t = tables(n)
+    bits = np.uint64(cell_bits(n))
+    blank_code = np.uint64(n * n - 1)
+    goal = np.uint64(goal_state(n))
+
+    start = np.array([pack_board(initial_board, n)], dtype=np.uint64)
+    if start[0] == goal:
+        return []
+    profile = stats.phase if stats is not None else (lambda phase: nullcontext())
+    evaluate = linear_conflict_batch if conflicts else manhattan_batch
+    start_h = evaluate(unpack_boards(start, n), n).astype(np.int16)
+    start_layer = (start, np.array([initial_board.index(-1)], dtype=np.int8), start_h, np.full(1, -1, dtype=np.int8))
+    bound = int(start_h[0])
+    while True:
+        if stats is not None:
+            stats.bound = bound
+        # Each layer: sorted keys, blank indexes, heuristic values and the direction that reached each board
+        layers = [start_layer]
+        next_bound = None
+        g = 0
+        while len(layers[-1][0]):
+            keys, blanks, hs, _ = layers[-1]
+            previous = layers[-2][0] if len(layers) > 1 else start[:0]
+            parts = []
+            for first in range(0, len(keys), CHUNK_SIZE):
+                chunk = slice(first, first + CHUNK_SIZE)
+                for d in range(len(DIRECTIONS)):
+                    tile_idx = t.moves[blanks[chunk], d]
+                    valid = tile_idx >= 0
+                    parent, blank, h = keys[chunk][valid], blanks[chunk][valid].astype(np.intp), hs[chunk][valid]
+                    with profile("moves"):
+                        tile_idx = tile_idx[valid]
+                        tile_shift = tile_idx.astype(np.uint64) * bits
+                        tile = (parent >> tile_shift) & t.mask
+                        swap = tile ^ blank_code
+                        child = parent ^ (swap << tile_shift) ^ (swap << (blank.astype(np.uint64) * bits))
+                    # Drop boards of the layer above the parents (undoing a move lands there)
+                    if len(previous):
+                        with profile("duplicates"):
+                            found = np.searchsorted(previous, child).clip(max=len(previous) - 1)
+                            fresh = previous[found] != child
+                            if stats is not None:
+                                stats.duplicates += len(fresh) - int(fresh.sum())
+                            parent, child, blank, tile_idx, tile, h = (
+                                parent[fresh], child[fresh], blank[fresh], tile_idx[fresh], tile[fresh], h[fresh])
+                    # Only the moved tile's distance changes, and only the two
+                    # lines it leaves and enters can change their conflicts
+                    with profile("heuristic"):
+                        tile = tile.astype(np.intp)
+                        h = h + t.distance[tile, blank] - t.distance[tile, tile_idx]
+                        if conflicts:
+                            if d < 2:  # Up or down: the tile changes rows
+                                line_conflicts, line_bits = t.row_conflicts, t.row_bits
+                                lines = (tile_idx // n, blank // n)
+                            else:
+                                line_conflicts, line_bits = t.col_conflicts, t.col_bits
+                                lines = (tile_idx % n, blank % n)
+                            for line in lines:
+                                h += (line_conflicts[line, line_bits(child, line)]
+                                      - line_conflicts[line, line_bits(parent, line)])
+                    f = g + 1 + h
+                    within = f <= bound
+                    if not within.all():
+                        lowest = int(f[~within].min())
+                        next_bound = lowest if next_bound is None else min(next_bound, lowest)
+                    parts.append((child[within], tile_idx[within].astype(np.int8), h[within].astype(np.int16),
+                                  np.full(int(within.sum()), d, dtype=np.int8)))
+                    if stats is not None:
+                        stats.generated += int(within.sum())
+                if stats is not None:
+                    stats.expanded += len(keys[chunk])
+                    stats.check()
+            # Keep one copy of every board of the new layer, sorted for the lookups
+            with profile("duplicates"):
+                generated = np.concatenate([part[0] for part in parts])
+                children, unique = np.unique(generated, return_index=True)
+                layers.append((children,) + tuple(np.concatenate([part[i] for part in parts])[unique]
+                                                  for i in (1, 2, 3)))
+            g += 1
+            if stats is not None:
+                stats.duplicates += len(generated) - len(children)
+                stats.sample(len(children), sum(len(layer[0]) for layer in layers))
+            if len(children) and children[np.searchsorted(children, goal).clip(max=len(children) - 1)] == goal:
+                return rebuild_layered_path(layers, n)
+        if next_bound is None:
+            return None  # Every board was visited (shouldn't happen for solvable puzzles)
+        bound = next_bound
+
+
+def rebuild_layered_path(layers, grid_size):
+    """Walk back from the goal in the last layer to the start board"""
+    state = goal_state(grid_size)
+    blank = grid_size * grid_size - 1
+    path = []
+    for keys, _, _, directions in reversed(layers[1:]):
+        direction = DIRECTIONS[directions[np.searchsorted(keys, np.uint64(state))]]
+        path.append((direction, blank))
+        parent_blank = blank - blank_offset(direction, grid_size)
+        state = slide(state, parent_blank, blank, grid_size)
+        blank = parent_blank
+    path.reverse()
+    return path
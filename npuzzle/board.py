@@ -0,0 +1,130 @@
+"""Board state for playing moves one at a time
+
+A Board keeps the flat tile list together with the index of the blank, a
+Zobrist hash and the Manhattan distance, and updates all three for the one
+tile that moves. Finding the tile that moves uses a table per grid size, so a
+move costs the same on a 3x3 board as on a 6x6 one. The solvers search on
+packed ints (see state.py), which make exact keys for their closed sets;
+Board is what the game and the move-by-move helpers work on.
+"""
+import random
+from functools import lru_cache
+
+from .heuristics import manhattan_table
+from .state import DIRECTIONS, move_table
+
+
+@lru_cache(maxsize=None)
+def neighbor_table(grid_size):
+    """Return, for each blank index, a dict of direction -> index of the tile that moves"""
+    return tuple({direction: tile_idx for tile_idx, direction in moves} for moves in move_table(grid_size))
+
+
+@lru_cache(maxsize=None)
+def zobrist_keys(grid_size):
+    """Return keys[tile][index]: random 64-bit key of a tile at an index
+
+    The keys come from a fixed seed, so hashes are the same in every process.
+    The blank has no keys: its place follows from the tiles'.
+    """
+    rng = random.Random(grid_size)
+    cells = grid_size * grid_size
+    return tuple(tuple(rng.getrandbits(64) for _ in range(cells)) for _ in range(cells - 1))
+
+
+def zobrist_hash(tiles, grid_size):
+    """Zobrist hash of a board list"""
+    keys = zobrist_keys(grid_size)
+    value = 0
+    for i, tile in enumerate(tiles):
+        if tile != -1:
+            value ^= keys[tile][i]
+    return value
+
+
+@lru_cache(maxsize=None)
+def goal_hash(grid_size):
+    """Zobrist hash of the solved board"""
+    return zobrist_hash(list(range(grid_size * grid_size - 1)) + [-1], grid_size)
+
+
+class Board:
+    """Puzzle board that tracks its blank, hash and Manhattan distance
+
+    Reads like the board list it wraps (len, indexing, iteration), so it can
+    be drawn and handed to the solvers as is. Change it through `move` and
+    `slide` only, which keep the tracked values in step.
+    """
+    __slots__ = ("tiles", "grid_size", "blank", "hash", "distance", "_neighbors", "_keys", "_manhattan")
+
+    def __init__(self, tiles, grid_size):
+        self.tiles = list(tiles)
+        self.grid_size = grid_size
+        self.blank = self.tiles.index(-1)
+        self.hash = zobrist_hash(self.tiles, grid_size)
+        self._neighbors = neighbor_table(grid_size)
+        self._keys = zobrist_keys(grid_size)
+        self._manhattan = manhattan_table(grid_size)
+        self.distance = sum(self._manhattan[tile][i] for i, tile in enumerate(self.tiles) if tile != -1)
+
+    def __len__(self):
+        return len(self.tiles)
+
+    def __getitem__(self, index):
+        return self.tiles[index]
+
+    def __iter__(self):
+        return iter(self.tiles)
+
+    def __eq__(self, other):
+        if isinstance(other, Board):
+            return self.hash == other.hash and self.tiles == other.tiles
+        return self.tiles == other
+
+    __hash__ = None  # Mutable; use .hash as a key for the current position
+
+    def __repr__(self):
+        return f"Board({self.tiles!r}, {self.grid_size})"
+
+    def index(self, tile):
+        """Index of a tile, without a scan for the blank"""
+        return self.blank if tile == -1 else self.tiles.index(tile)
+
+    def copy(self):
+        board = Board.__new__(Board)
+        for name in Board.__slots__:
+            setattr(board, name, getattr(self, name))
+        board.tiles = list(self.tiles)
+        return board
+
+    def can_move(self, direction):
+        return direction in self._neighbors[self.blank]
+
+    def move(self, direction):
+        """Slide the tile next to the blank in a direction (see DIRECTIONS)
+
+        Returns the index of the tile that moved (the new blank), or None if
+        no tile can move that way.
+        """
+        tile_idx = self._neighbors[self.blank].get(direction)
+        if tile_idx is not None:
+            self.slide(tile_idx)
+        return tile_idx
+
+    def slide(self, tile_idx):
+        """Slide the tile at tile_idx, which must be next to the blank, into it"""
+        blank = self.blank
+        tile = self.tiles[tile_idx]
+        self.tiles[blank], self.tiles[tile_idx] = tile, -1
+        keys = self._keys[tile]
+        self.hash ^= keys[tile_idx] ^ keys[blank]
+        self.distance += self._manhattan[tile][blank] - self._manhattan[tile][tile_idx]
+        self.blank = tile_idx
+
+    def moves(self):
+        """Directions that can be played, in DIRECTIONS order"""
+        return [direction for direction in DIRECTIONS if direction in self._neighbors[self.blank]]
+
+    def is_solved(self):
+        # Every tile is home exactly when the distance is 0; the hash is a cheaper first test
+        return self.hash == goal_hash(self.grid_size) and self.distance == 0
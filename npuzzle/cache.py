@@ -0,0 +1,156 @@
+"""Persistent cache of solved boards
+
+Every board on a stored solution path is recorded with the move to play from
+it and how many moves are left, so a board reached by following part of a
+cached solution (or a few manual moves that happen to land on it) is solved
+without a search. Each board also records the suboptimality bound its
+solution is known to meet (1 for an optimal one), so a solver asking for a
+tighter bound than the cache can vouch for searches instead. Entries live in an SQLite file next to the pattern
+databases; the least recently used ones are dropped once the cache holds
+more than `max_entries` boards.
+"""
+import math
+import os
+import sqlite3
+import time
+from functools import lru_cache
+
+from .pdb import DATA_DIR
+from .state import blank_offset, cell_bits, pack_board
+
+DEFAULT_MAX_ENTRIES = 1_000_000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS boards (
+    grid_size INTEGER NOT NULL,
+    state BLOB NOT NULL,
+    move TEXT NOT NULL,
+    distance INTEGER NOT NULL,
+    bound REAL NOT NULL,
+    used REAL NOT NULL,
+    PRIMARY KEY (grid_size, state)
+);
+CREATE INDEX IF NOT EXISTS boards_used ON boards (used);
+"""
+
+
+def row_bounds(path, bound):
+    """Bound met by the rest of a solution from each of its boards
+
+    A solution at most `bound` times longer than optimal does not make every
+    one of its tails as good: the board k moves in is at least
+    len(path) / bound - k moves from the goal, so its tail is at most
+    (len(path) - k) / (len(path) / bound - k) times longer than optimal.
+    """
+    length = len(path)
+    # Never below `bound`, which the formula only misses by rounding; a board off the goal is at least 1 move away
+    return [max(bound, (length - step) / max(length / bound - step, 1)) for step in range(length)]
+
+
+def state_key(board, grid_size):
+    """Packed board as bytes (boards above 4x4 do not fit an SQLite integer)"""
+    size = (cell_bits(grid_size) * grid_size * grid_size + 7) // 8
+    return pack_board(board, grid_size).to_bytes(size, "little")
+
+
+class SolutionCache:
+    """Size-bounded LRU cache of solutions stored in an SQLite file
+
+    A connection is opened per call, so one cache can be used from the game's
+    solver threads and from several processes at once.
+    """
+
+    def __init__(self, path=None, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path or os.path.join(DATA_DIR, "solutions.sqlite")
+        self.max_entries = max_entries
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with self._connect() as db:
+            columns = [row[1] for row in db.execute("PRAGMA table_info(boards)")]
+            if columns and "bound" not in columns:
+                db.execute("DROP TABLE boards")  # Made before bounds were stored; it only holds solutions
+            db.executescript(SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def lookup(self, initial_board, grid_size, bound=None):
+        """Cached solution for a board, or None
+
+        With a `bound` only a solution known to be at most `bound` times
+        longer than optimal is returned (1 for optimal ones only). Only the
+        board's own row needs checking: every board after it on the way has
+        a shorter stored solution, so the whole walk is no longer than the
+        distance the bound was recorded with.
+        """
+        board = list(initial_board)
+        blank = board.index(-1)
+        path = []
+        keys = []
+        db = self._connect()
+        try:
+            with db:
+                while True:
+                    key = state_key(board, grid_size)
+                    row = db.execute("SELECT move, distance, bound FROM boards WHERE grid_size = ? AND state = ?",
+                                     (grid_size, key)).fetchone()
+                    if row is None:
+                        return None  # Not cached, or a board on the way was evicted
+                    if not keys and bound is not None and row[2] > bound:
+                        return None  # Cached, but not known to be good enough
+                    direction, distance = row[0], row[1]
+                    keys.append(key)
+                    if distance == 0:
+                        break
+                    tile_idx = blank + blank_offset(direction, grid_size)
+                    board[blank], board[tile_idx] = board[tile_idx], -1
+                    path.append((direction, tile_idx))
+                    blank = tile_idx
+                # Keep the whole path fresh so it is evicted together
+                db.executemany("UPDATE boards SET used = ? WHERE grid_size = ? AND state = ?",
+                               [(time.time(), grid_size, key) for key in keys])
+        finally:
+            db.close()
+        return path
+
+    def store(self, initial_board, grid_size, path, bound=None):
+        """Record every board along a solution path
+
+        `bound` is the suboptimality bound the solution is known to meet (1
+        when optimal, None when nothing is known). Boards already cached
+        with a shorter solution keep it, and a board given a shorter
+        solution keeps the tighter of the two bounds, which holds for the
+        shorter one too. Each cached board leads to one with a smaller
+        distance, so walking the cache always ends at the goal.
+        """
+        board = list(initial_board)
+        now = time.time()
+        rows = []
+        bounds = row_bounds(path, bound) if bound is not None else [math.inf] * len(path)
+        for step, (direction, tile_idx) in enumerate(path):
+            rows.append((grid_size, state_key(board, grid_size), direction, len(path) - step, bounds[step], now))
+            blank = board.index(-1)
+            board[blank], board[tile_idx] = board[tile_idx], -1
+        rows.append((grid_size, state_key(board, grid_size), "", 0, 1.0, now))
+        db = self._connect()
+        try:
+            with db:
+                db.executemany("""
+                    INSERT INTO boards (grid_size, state, move, distance, bound, used) VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (grid_size, state) DO UPDATE SET
+                        move = excluded.move, distance = excluded.distance, bound = MIN(bound, excluded.bound)
+                    WHERE excluded.distance < distance OR (excluded.distance = distance AND excluded.bound < bound)
+                """, rows)
+                db.executemany("UPDATE boards SET used = ? WHERE grid_size = ? AND state = ?",
+                               [(now, grid_size, row[1]) for row in rows])
+                excess = db.execute("SELECT COUNT(*) FROM boards").fetchone()[0] - self.max_entries
+                if excess > 0:
+                    db.execute("DELETE FROM boards WHERE rowid IN (SELECT rowid FROM boards ORDER BY used LIMIT ?)",
+                               (excess,))
+        finally:
+            db.close()
+
+
+@lru_cache(maxsize=None)
+def default_cache():
+    """SolutionCache in the data directory, shared by the whole process"""
+    return SolutionCache()
@@ -0,0 +1,286 @@
+"""Game rules and the A* solver, free of any pygame or PIL dependency
+
+Boards are flat lists in row-major order holding the tile numbers
+0..grid_size**2 - 2 and -1 for the empty tile; a board is solved when every
+tile sits at the index equal to its number and the blank is last.
+"""
+import heapq
+import random
+import warnings
+from functools import lru_cache
+
+from .board import Board, neighbor_table
+from .heuristics import ManhattanHeuristic, as_heuristic
+from .ida_star import ida_star_solve
+from .pdb import load_pattern_database
+from .state import pack_board, unpack_board, goal_state, cell_bits, move_table, rebuild_path
+from .stats import CHECK_INTERVAL
+from .table import TABLE_SIZES, table_solve
+
+# Solvers available through solve(); "Fast" is bounded-suboptimal and anytime,
+# "Batched" needs NumPy, "Parallel" runs IDA* on every core and "External"
+# keeps its frontier on disk
+SOLVERS = ("A*", "IDA*", "PDB", "Fast", "Batched", "Parallel", "External")
+
+# Board sizes the game offers and the batch tool and service accept
+GRID_SIZES = range(2, 7)
+
+
+def create_solvable_board(grid_size, rng=random):
+    """Create a shuffled but solvable puzzle board
+
+    Half of all shuffles cannot be solved; swapping two tiles turns such a
+    shuffle into a solvable one, so no shuffle is thrown away. Pass a seeded
+    random.Random as `rng` to get the same boards every run.
+    """
+    board = list(range(grid_size * grid_size))
+    board[-1] = -1  # Use -1 instead of None for empty tile
+    rng.shuffle(board)
+
+    # Check if the puzzle is solvable, and swap two tiles if it is not
+    if not is_solvable(board, grid_size):
+        # The first three cells hold at least two tiles
+        first, second = [i for i, tile in enumerate(board[:3]) if tile != -1][:2]
+        board[first], board[second] = board[second], board[first]
+    return board
+
+
+def count_inversions(values):
+    """Number of pairs out of order in a permutation of 0..len(values)-1
+
+    Uses a Fenwick tree over the values already seen, O(n log n).
+    """
+    size = len(values)
+    tree = [0] * (size + 1)
+    inversions = 0
+    for seen, value in enumerate(values):
+        # Seen values greater than this one are inversions
+        smaller_or_equal = 0
+        i = value + 1
+        while i > 0:
+            smaller_or_equal += tree[i]
+            i -= i & -i
+        inversions += seen - smaller_or_equal
+        i = value + 1
+        while i <= size:
+            tree[i] += 1
+            i += i & -i
+    return inversions
+
+
+def is_solvable(board, grid_size):
+    """Check if the puzzle is solvable"""
+    # Count inversions ignoring the empty tile (-1)
+    inversions = count_inversions([x for x in board if x != -1])
+
+    # For odd grid sizes, solvable if inversions are even
+    if grid_size % 2 == 1:
+        return inversions % 2 == 0
+    else:
+        # For even grid sizes, need to consider row of blank
+        blank_row = board.index(-1) // grid_size
+        return (inversions + blank_row) % 2 == 1
+
+
+def is_valid_board(board, grid_size):
+    """Check that a board list holds 0..grid_size**2 - 2 and -1 once each
+
+    For boards from outside (files, requests): the grid size is checked
+    first, so a bogus one costs nothing, and booleans are not tiles.
+    """
+    if type(grid_size) is not int or grid_size not in GRID_SIZES:
+        return False
+    if not isinstance(board, list) or len(board) != grid_size * grid_size:
+        return False
+    if not all(type(tile) is int for tile in board):
+        return False
+    return sorted(board) == [-1] + list(range(grid_size * grid_size - 1))
+
+
+def get_empty_pos(board, grid_size):
+    """Get the position of the empty tile"""
+    i = board.index(-1)  # Board tracks its blank, so no scan there
+    return (i % grid_size, i // grid_size)  # (col, row)
+
+
+def move_tile(board, direction, grid_size):
+    """Move a tile in the specified direction
+
+    Works on a Board or a plain board list; returns the index of the tile
+    that moved, or None if no tile can move that way.
+    """
+    if isinstance(board, Board):
+        return board.move(direction)
+    blank = board.index(-1)
+    swap_idx = neighbor_table(grid_size)[blank].get(direction)
+    if swap_idx is not None:
+        board[blank], board[swap_idx] = board[swap_idx], board[blank]
+    return swap_idx  # Return the index of the tile that moved
+
+
+@lru_cache(maxsize=None)
+def goal_board(grid_size):
+    """Solved board list, shared: do not modify"""
+    return list(range(grid_size * grid_size - 1)) + [-1]
+
+
+def is_solved(board, grid_size):
+    """Check if the puzzle is solved"""
+    if isinstance(board, Board):
+        return board.is_solved()
+    return board == goal_board(grid_size)
+
+
+def heuristic(board, grid_size):
+    """Calculate Manhattan distance heuristic for A*"""
+    distance = 0
+    for i in range(grid_size * grid_size):
+        if board[i] == -1:
+            continue
+        # Current position
+        current_row, current_col = i // grid_size, i % grid_size
+        # Goal position
+        goal_row, goal_col = board[i] // grid_size, board[i] % grid_size
+        # Add Manhattan distance for this tile
+        distance += abs(current_row - goal_row) + abs(current_col - goal_col)
+    return distance
+
+
+def a_star_solve(initial_board, tiles, grid_size, heuristic=None, stats=None, weight=1, cost_limit=None):
+    """Solve the puzzle using A* algorithm
+
+    Boards are packed into ints while searching. The closed map only keeps the
+    move that reached each state and the path is rebuilt once at the goal.
+    Any admissible heuristic can be passed; the default is Manhattan distance.
+    A SearchStats passed as `stats` receives progress and can stop the search.
+
+    With a `weight` above 1 the heuristic is multiplied by it (weighted A*):
+    the search is much faster and the solution at most `weight` times longer
+    than optimal. Nodes that cannot lead to a solution shorter than
+    `cost_limit` moves are pruned, so None is returned if there is none.
+    """
+    heuristic = ManhattanHeuristic() if heuristic is None else as_heuristic(heuristic)
+    update = heuristic.updater(grid_size)
+    moves = move_table(grid_size)
+    bits = cell_bits(grid_size)
+    mask = (1 << bits) - 1
+    blank_code = grid_size * grid_size - 1
+    goal = goal_state(grid_size)
+    heappush, heappop, unpack = heapq.heappush, heapq.heappop, unpack_board
+    if stats is not None:
+        # Wrapped only when profiling, otherwise these are the plain functions
+        heappush, heappop = stats.timed("open list", heappush), stats.timed("open list", heappop)
+        update = stats.timed("heuristic", update)
+        unpack = stats.timed("moves", unpack)
+
+    # Priority queue: (priority, steps, tiebreaker, state, blank index, heuristic, move)
+    start = pack_board(initial_board, grid_size)
+    h = heuristic(initial_board, grid_size)
+    heap = [(weight * h, 0, 0, start, initial_board.index(-1), h, None)]
+    closed = {}  # packed state -> direction of the move that reached it
+    tiebreaker = 1  # To ensure proper comparison in heap
+
+    while heap:
+        f, steps, _, state, blank, h, move = heappop(heap)
+        if state in closed:
+            if stats is not None:
+                stats.duplicates += 1
+            continue  # Already expanded through a path at least as short
+        closed[state] = move
+        if stats is not None:
+            stats.expanded += 1
+            stats.bound = f
+            if stats.expanded % CHECK_INTERVAL == 0:
+                stats.sample(len(heap), len(closed))
+                stats.check()
+
+        if state == goal:
+            if stats is not None:
+                stats.sample(len(heap), len(closed))
+            return rebuild_path(closed, state, blank, grid_size)
+
+        board = unpack(state, grid_size)
+        for tile_idx, direction in moves[blank]:
+            tile = (state >> (tile_idx * bits)) & mask
+            swap = tile ^ blank_code
+            new_state = state ^ (swap << (tile_idx * bits)) ^ (swap << (blank * bits))
+            if new_state in closed:
+                if stats is not None:
+                    stats.duplicates += 1
+                continue
+            board[blank], board[tile_idx] = tile, -1
+            new_h = update(board, h, tile, tile_idx, blank)
+            board[blank], board[tile_idx] = -1, tile
+            if cost_limit is not None and steps + 1 + new_h >= cost_limit:
+                continue
+            heappush(heap, (steps + 1 + weight * new_h, steps + 1, tiebreaker, new_state, tile_idx, new_h, direction))
+            tiebreaker += 1
+            if stats is not None:
+                stats.generated += 1
+
+    return None  # No solution found (shouldn't happen for solvable puzzles)
+
+
+def solve(board, grid_size, solver="A*", stats=None, bound=2, found=None, cache=None):
+    """Solve the puzzle with one of the SOLVERS
+
+    Boards small enough for a distance table are solved from the table
+    whatever the solver. Otherwise a SolutionCache passed as `cache` is
+    asked first for a solution meeting the solver's suboptimality bound, and
+    the solution stored in it afterwards with that bound. `bound` and
+    `found` only apply to the "Fast" solver, see anytime_solve.
+    """
+    if solver not in SOLVERS:
+        raise ValueError(f"Unknown solver {solver!r}, expected one of {SOLVERS}")
+    if grid_size in TABLE_SIZES:
+        try:
+            return table_solve(board, grid_size)
+        except OSError as e:
+            warnings.warn(f"Distance table unavailable ({e}), searching instead")
+    bound = bound if solver == "Fast" else 1
+    if cache is not None:
+        path = cache.lookup(board, grid_size, bound)
+        if path is not None:
+            return path
+    path = run_solver(board, grid_size, solver, stats, bound, found)
+    # A search stopped early returns its best solution so far, which meets no bound
+    if cache is not None and path is not None and (stats is None or stats.stop_reason is None):
+        cache.store(board, grid_size, path, bound)
+    return path
+
+
+def run_solver(board, grid_size, solver, stats=None, bound=2, found=None):
+    """Search for a solution with one of the SOLVERS"""
+    if solver == "IDA*":
+        return ida_star_solve(board, grid_size, stats=stats)
+    if solver == "PDB":
+        # IDA* with pattern databases, falling back to linear conflicts until they are built
+        try:
+            pattern_database = load_pattern_database(grid_size)
+        except (ValueError, FileNotFoundError) as e:
+            warnings.warn(f"Pattern database unavailable ({e}), using linear conflicts")
+            pattern_database = None
+        return ida_star_solve(board, grid_size, heuristic=pattern_database, stats=stats)
+    if solver == "A*":
+        return a_star_solve(board, None, grid_size, stats=stats)
+    if solver == "Fast":
+        from .anytime import anytime_solve  # anytime builds on a_star_solve
+        return anytime_solve(board, grid_size, bound, stats=stats, found=found)
+    if solver == "Batched":
+        # Vectorized search, falling back to IDA* without NumPy or above 4x4
+        try:
+            from .batched import MAX_GRID_SIZE, batched_solve
+        except ImportError as e:
+            warnings.warn(f"Batched search unavailable ({e}), using IDA*")
+        else:
+            if grid_size <= MAX_GRID_SIZE:
+                return batched_solve(board, grid_size, stats=stats)
+            warnings.warn(f"Batched search supports boards up to {MAX_GRID_SIZE}x{MAX_GRID_SIZE}, using IDA*")
+        return ida_star_solve(board, grid_size, stats=stats)
+    if solver == "Parallel":
+        from .parallel import parallel_ida_star_solve  # Only loaded when used
+        return parallel_ida_star_solve(board, grid_size, stats=stats)
+    if solver == "External":
+        from .external import external_solve
+        return external_solve(board, grid_size, stats=stats)
+    raise ValueError(f"Unknown solver {solver!r}, expected one of {SOLVERS}")
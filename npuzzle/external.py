@@ -0,0 +1,273 @@
+"""External-memory A* for searches whose frontier does not fit in memory
+
+Open boards are kept on disk in buckets by depth g and heuristic h and
+expanded in order of f = g + h, then g, like External A* (Edelkamp, Jabbar
+and Schroedl). Every board is a fixed-size record: the packed state in big
+endian, so records sort as the states do, and one byte for the move that
+reached it. Children are buffered in memory and written out as sorted runs
+whenever the buffers hold `memory_limit` bytes' worth of records, so memory
+use stays flat however large the search grows.
+
+Duplicates are only removed when a bucket comes up for expansion (delayed
+duplicate detection): its runs are merged, repeated states dropped, and so
+are states already in the expanded buckets with the same h two and one
+levels up. A state always has the same h and, the puzzle graph being
+undirected, a board reached again can only be reached at most two moves
+deeper. The expanded buckets are kept on disk, sorted, so the solution is
+rebuilt by looking up each parent there. With a consistent heuristic (the
+Manhattan-based ones and the additive pattern databases are) the first
+goal found is optimal.
+"""
+import heapq
+import os
+import shutil
+import tempfile
+
+from .heuristics import as_heuristic
+from .state import (DIRECTIONS, OPPOSITE, blank_offset, cell_bits, goal_state, move_table, pack_board, slide,
+                    unpack_board)
+from .stats import CHECK_INTERVAL, current_rss
+
+# Default memory for buffered records, in bytes
+DEFAULT_MEMORY_LIMIT = 256 * 1024 ** 2
+
+# Least memory for buffered records whatever the budget, in bytes
+MIN_MEMORY_LIMIT = 4 * 1024 ** 2
+
+# Share of a SearchStats memory budget, once the memory already in use is
+# taken out, given to the buffers; the rest covers sorting, merging and the
+# allocator keeping freed memory
+BUDGET_SHARE = 0.5
+
+# Rough memory taken by one buffered record: a bytes object and its list slot
+RECORD_OVERHEAD = 48
+
+# Direction byte of the start board
+START = len(DIRECTIONS)
+
+# Records read or written at a time
+IO_RECORDS = 8192
+
+
+def read_records(path, record_size):
+    """Yield the records of a file one by one"""
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(record_size * IO_RECORDS)
+            if not block:
+                return
+            for i in range(0, len(block), record_size):
+                yield block[i:i + record_size]
+
+
+def find_record(path, key, record_size):
+    """Record of a sorted file whose state bytes are `key`, or None (binary search on disk)"""
+    with open(path, "rb") as f:
+        low, high = 0, os.path.getsize(path) // record_size
+        while low < high:
+            middle = (low + high) // 2
+            f.seek(middle * record_size)
+            record = f.read(record_size)
+            if record[:-1] < key:
+                low = middle + 1
+            elif record[:-1] > key:
+                high = middle
+            else:
+                return record
+    return None
+
+
+class BucketStore:
+    """Sorted run files of every bucket and the expanded buckets, in one directory"""
+
+    def __init__(self, directory, record_size, memory_limit):
+        self.directory = directory
+        self.record_size = record_size
+        self.capacity = max(1, memory_limit // (RECORD_OVERHEAD + record_size))
+        self.buffers = {}  # (g, h) -> records not written yet
+        self.buffered = 0
+        self.runs = {}  # (g, h) -> run files
+        self.expanded = {}  # (g, h) -> sorted file of the bucket's unique boards
+        self.duplicates = 0  # Records dropped by take
+        self.files = 0
+
+    def _new_path(self):
+        self.files += 1
+        return os.path.join(self.directory, f"{self.files}.run")
+
+    def add(self, bucket, record):
+        buffer = self.buffers.get(bucket)
+        if buffer is None:
+            buffer = self.buffers[bucket] = []
+        buffer.append(record)
+        self.buffered += 1
+        if self.buffered >= self.capacity:
+            self.spill()
+
+    def spill(self, bucket=None):
+        """Write the buffered records (of one bucket, or all) as sorted runs"""
+        for key in [bucket] if bucket is not None else list(self.buffers):
+            records = self.buffers.pop(key, None)
+            if not records:
+                continue
+            records.sort()
+            path = self._new_path()
+            with open(path, "wb") as f:
+                for i in range(0, len(records), IO_RECORDS):
+                    f.write(b"".join(records[i:i + IO_RECORDS]))
+            self.runs.setdefault(key, []).append(path)
+            self.buffered -= len(records)
+
+    def has(self, bucket):
+        return bucket in self.runs or bucket in self.buffers
+
+    def pending(self):
+        """Buckets with boards still to expand"""
+        return set(self.runs) | set(self.buffers)
+
+    def take(self, bucket):
+        """Unique records of a bucket, sorted, minus the boards of the same h two and one levels up
+
+        The records are also written to the bucket's expanded file as they
+        are yielded.
+        """
+        self.spill(bucket)
+        runs = self.runs.pop(bucket)
+        g, h = bucket
+        earlier = [read_records(self.expanded[key], self.record_size)
+                   for key in ((g - 2, h), (g - 1, h)) if key in self.expanded]
+        heads = [next(records, None) for records in earlier]
+        path = self._new_path()
+        self.expanded[bucket] = path
+        previous = None
+        with open(path, "wb") as out:
+            block = []
+            for record in heapq.merge(*(read_records(run, self.record_size) for run in runs)):
+                key = record[:-1]
+                if key == previous:
+                    self.duplicates += 1
+                    continue  # Same board from another parent
+                previous = key
+                seen = False
+                for i, records in enumerate(earlier):
+                    while heads[i] is not None and heads[i][:-1] < key:
+                        heads[i] = next(records, None)
+                    if heads[i] is not None and heads[i][:-1] == key:
+                        seen = True
+                if seen:
+                    self.duplicates += 1
+                    continue
+                block.append(record)
+                if len(block) == IO_RECORDS:
+                    out.write(b"".join(block))
+                    block = []
+                yield record
+            out.write(b"".join(block))
+        for run in runs:
+            os.remove(run)
+
+
+def buffer_limit(stats):
+    """Memory for buffered records under the budget of a SearchStats, in bytes"""
+    if stats is None or stats.memory_limit is None:
+        return DEFAULT_MEMORY_LIMIT
+    available = stats.memory_limit - (current_rss() or 0)
+    return int(min(DEFAULT_MEMORY_LIMIT, max(MIN_MEMORY_LIMIT, available * BUDGET_SHARE)))
+
+
+def external_solve(initial_board, grid_size, heuristic=None, stats=None, memory_limit=None, directory=None):
+    """Solve a solvable puzzle optimally with its frontier on disk, returning a list of (direction, moved_tile)
+
+    `heuristic` must be consistent; it defaults to Manhattan distance plus
+    linear conflicts. About `memory_limit` bytes of records are buffered
+    before they are written to a temporary directory inside `directory`
+    (default: the system temporary directory), which is removed afterwards.
+    A SearchStats passed as `stats` receives progress and can stop the
+    search; `memory_limit` defaults to part of its memory budget, if it has
+    one, so the search spills to disk instead of running out.
+    """
+    heuristic = as_heuristic(heuristic)
+    if memory_limit is None:
+        memory_limit = buffer_limit(stats)
+    n = grid_size
+    update = heuristic.updater(n)
+    moves = move_table(n)
+    bits = cell_bits(n)
+    mask = (1 << bits) - 1
+    blank_code = n * n - 1
+    goal = goal_state(n)
+    state_size = (bits * n * n + 7) // 8
+    record_size = state_size + 1
+    direction_codes = {direction: bytes([code]) for code, direction in enumerate(DIRECTIONS)}
+
+    start = pack_board(initial_board, n)
+    if start == goal:
+        return []
+    work = tempfile.mkdtemp(prefix="npuzzle-", dir=directory)
+    try:
+        store = BucketStore(work, record_size, memory_limit)
+        h = heuristic(initial_board, n)
+        store.add((0, h), start.to_bytes(state_size, "big") + bytes([START]))
+        f = h
+        while True:
+            pending = store.pending()
+            if not pending:
+                return None  # No solution found (shouldn't happen for solvable puzzles)
+            f = max(f, min(g + h for g, h in pending))
+            if stats is not None:
+                stats.bound = f
+            for g in range(f + 1):
+                bucket = (g, f - g)
+                if not store.has(bucket):
+                    continue
+                h = f - g
+                for record in store.take(bucket):
+                    state = int.from_bytes(record[:-1], "big")
+                    if state == goal:
+                        if stats is not None:
+                            stats.duplicates = store.duplicates
+                            stats.sample(store.buffered)
+                        return rebuild_external_path(store, record, g, heuristic, n)
+                    reached = DIRECTIONS[record[-1]] if record[-1] != START else None
+                    board = unpack_board(state, n)
+                    blank = board.index(-1)
+                    for tile_idx, direction in moves[blank]:
+                        if direction == OPPOSITE[reached]:
+                            continue  # Back to the parent
+                        tile = (state >> (tile_idx * bits)) & mask
+                        swap = tile ^ blank_code
+                        child = state ^ (swap << (tile_idx * bits)) ^ (swap << (blank * bits))
+                        board[blank], board[tile_idx] = tile, -1
+                        child_h = update(board, h, tile, tile_idx, blank)
+                        board[blank], board[tile_idx] = -1, tile
+                        store.add((g + 1, child_h), child.to_bytes(state_size, "big") + direction_codes[direction])
+                    if stats is not None:
+                        stats.expanded += 1
+                        stats.generated += len(moves[blank]) - (reached is not None)
+                        if stats.expanded % CHECK_INTERVAL == 0:
+                            stats.duplicates = store.duplicates
+                            stats.sample(store.buffered)
+                            stats.check()
+            f += 1
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+def rebuild_external_path(store, record, g, heuristic, grid_size):
+    """Walk back from the goal's record at depth g through the expanded buckets"""
+    state_size = store.record_size - 1
+    state = int.from_bytes(record[:-1], "big")
+    blank = grid_size * grid_size - 1
+    path = []
+    while record[-1] != START:
+        direction = DIRECTIONS[record[-1]]
+        path.append((direction, blank))
+        parent_blank = blank - blank_offset(direction, grid_size)
+        state = slide(state, parent_blank, blank, grid_size)
+        blank = parent_blank
+        g -= 1
+        # The parent was expanded from the bucket of its own depth and heuristic value
+        bucket = (g, heuristic(unpack_board(state, grid_size), grid_size))
+        record = find_record(store.expanded[bucket], state.to_bytes(state_size, "big"), store.record_size)
+    path.reverse()
+    return path
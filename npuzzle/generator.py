@@ -0,0 +1,102 @@
+"""Solvable boards in bulk, optionally at a chosen difficulty
+
+Without a depth, boards are uniformly random solvable shuffles. With a depth,
+boards small enough for a distance table are exactly that many moves from
+the goal; larger boards are made by a random walk of that many moves from the
+goal that never undoes its previous move, so their optimal solution is at
+most `depth` moves (and usually close to it for short walks).
+
+    python -m npuzzle.generator 4 100 --depth 40 --seed 1 > boards.jsonl
+"""
+import argparse
+import json
+import random
+import sys
+from functools import lru_cache
+
+from .core import create_solvable_board
+from .state import OPPOSITE, move_table
+from .table import TABLE_SIZES, board_rank, load_distance_table
+
+
+@lru_cache(maxsize=None)
+def max_table_depth(grid_size):
+    """Largest distance in the distance table of a grid size"""
+    return max(bytes(load_distance_table(grid_size)))
+
+
+def random_walk_board(grid_size, depth, rng=random):
+    """Board reached from the goal by `depth` random moves, none undoing the one before"""
+    board = list(range(grid_size * grid_size - 1)) + [-1]
+    blank = len(board) - 1
+    moves = move_table(grid_size)
+    previous = None
+    for _ in range(depth):
+        tile_idx, previous = rng.choice([m for m in moves[blank] if m[1] != OPPOSITE[previous]])
+        board[blank], board[tile_idx] = board[tile_idx], -1
+        blank = tile_idx
+    return board
+
+
+def exact_depth_board(grid_size, depth, rng=random):
+    """Board whose optimal solution is exactly `depth` moves, from the distance table
+
+    The walk only takes moves that lead one step further from the goal and
+    starts over if it gets stuck before reaching `depth`.
+    """
+    if depth > max_table_depth(grid_size):
+        raise ValueError(f"No {grid_size}x{grid_size} board is {depth} moves from the goal")
+    table = load_distance_table(grid_size)
+    moves = move_table(grid_size)
+    while True:
+        board = list(range(grid_size * grid_size - 1)) + [-1]
+        blank = len(board) - 1
+        for distance in range(depth):
+            further = []
+            for tile_idx, _ in moves[blank]:
+                board[blank], board[tile_idx] = board[tile_idx], -1
+                if table[board_rank(board, grid_size)] == distance + 1:
+                    further.append(tile_idx)
+                board[tile_idx], board[blank] = board[blank], -1
+            if not further:
+                break
+            tile_idx = rng.choice(further)
+            board[blank], board[tile_idx] = board[tile_idx], -1
+            blank = tile_idx
+        else:
+            return board
+
+
+def generate_board(grid_size, depth=None, rng=random):
+    """One solvable board, `depth` moves from the goal if given (see module docstring)"""
+    if depth is None:
+        return create_solvable_board(grid_size, rng)
+    if grid_size in TABLE_SIZES:
+        return exact_depth_board(grid_size, depth, rng)
+    return random_walk_board(grid_size, depth, rng)
+
+
+def generate_boards(grid_size, count, depth=None, seed=None):
+    """`count` solvable boards; the same seed always gives the same boards"""
+    rng = random.Random(seed)
+    return [generate_board(grid_size, depth, rng) for _ in range(count)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m npuzzle.generator", description=__doc__.split("\n")[0])
+    parser.add_argument("grid_size", type=int)
+    parser.add_argument("count", type=int)
+    parser.add_argument("--depth", type=int, help="moves from the goal (exact for 2x2 and 3x3, at most otherwise)")
+    parser.add_argument("--seed", type=int, help="seed for reproducible boards")
+    args = parser.parse_args(argv)
+    try:
+        boards = generate_boards(args.grid_size, args.count, args.depth, args.seed)
+    except ValueError as e:
+        parser.error(str(e))
+    for board in boards:
+        print(json.dumps({"board": board, "grid_size": args.grid_size}))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""Heuristics shared by the puzzle solvers
+
+Solvers accept any object with the `Heuristic` interface. Plain functions with
+the signature of `heuristic(board, grid_size)` can be adapted with
+`as_heuristic`.
+"""
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def manhattan_table(grid_size):
+    """Return table[tile][index]: Manhattan distance of tile from its goal when placed at index"""
+    cells = grid_size * grid_size
+    return tuple(
+        tuple(abs(tile // grid_size - i // grid_size) + abs(tile % grid_size - i % grid_size)
+              for i in range(cells))
+        for tile in range(cells - 1)
+    )
+
+
+def manhattan_distance(board, grid_size):
+    """Sum of Manhattan distances of all tiles from their goal positions"""
+    table = manhattan_table(grid_size)
+    return sum(table[tile][i] for i, tile in enumerate(board) if tile != -1)
+
+
+@lru_cache(maxsize=65536)
+def line_conflict(goals):
+    """Extra moves needed by tiles that sit in their goal line but in the wrong order
+
+    `goals` lists, in board order, the goal offsets along the line of the tiles
+    that belong to that line. Every tile outside the longest increasing run has
+    to step out of the line and back in, costing two extra moves.
+    """
+    if len(goals) < 2:
+        return 0
+    # Longest increasing subsequence (lines hold at most 6 tiles)
+    best = []
+    for i, goal in enumerate(goals):
+        length = 1
+        for j in range(i):
+            if goals[j] < goal and best[j] + 1 > length:
+                length = best[j] + 1
+        best.append(length)
+    return 2 * (len(goals) - max(best))
+
+
+def row_conflict(board, grid_size, row):
+    """Linear conflict value of a single row"""
+    start = row * grid_size
+    return line_conflict(tuple(
+        tile % grid_size for tile in board[start:start + grid_size]
+        if tile != -1 and tile // grid_size == row
+    ))
+
+
+def column_conflict(board, grid_size, col):
+    """Linear conflict value of a single column"""
+    return line_conflict(tuple(
+        tile // grid_size for tile in board[col::grid_size]
+        if tile != -1 and tile % grid_size == col
+    ))
+
+
+def linear_conflicts(board, grid_size):
+    """Total linear conflict value over all rows and columns"""
+    return (sum(row_conflict(board, grid_size, r) for r in range(grid_size))
+            + sum(column_conflict(board, grid_size, c) for c in range(grid_size)))
+
+
+def manhattan_linear_conflict(board, grid_size):
+    """Manhattan distance plus linear conflicts (admissible)"""
+    return manhattan_distance(board, grid_size) + linear_conflicts(board, grid_size)
+
+
+class Heuristic:
+    """Base class for heuristics that can be plugged into the solvers"""
+    name = "heuristic"
+
+    def __call__(self, board, grid_size):
+        """Evaluate a whole board"""
+        raise NotImplementedError
+
+    def updater(self, grid_size):
+        """Return update(board, value, tile, src, dst) for boards of this size
+
+        The returned function gives the heuristic value after `tile` moved
+        from `src` to `dst`; `board` already reflects the move and `value` is
+        the value before it. Subclasses override this to avoid evaluating the
+        whole board on every move.
+        """
+        def update(board, value, tile, src, dst):
+            return self(board, grid_size)
+        return update
+
+
+class FunctionHeuristic(Heuristic):
+    """Adapter for a plain heuristic(board, grid_size) function"""
+
+    def __init__(self, function):
+        self.function = function
+        self.name = getattr(function, "__name__", "function")
+
+    def __call__(self, board, grid_size):
+        return self.function(board, grid_size)
+
+
+class ManhattanHeuristic(Heuristic):
+    """Manhattan distance, updated from the single moved tile"""
+    name = "manhattan"
+
+    def __call__(self, board, grid_size):
+        return manhattan_distance(board, grid_size)
+
+    def updater(self, grid_size):
+        table = manhattan_table(grid_size)
+
+        def update(board, value, tile, src, dst):
+            distances = table[tile]
+            return value + distances[dst] - distances[src]
+        return update
+
+
+class LinearConflictHeuristic(Heuristic):
+    """Manhattan distance plus linear conflicts"""
+    name = "linear-conflict"
+
+    def __call__(self, board, grid_size):
+        return manhattan_linear_conflict(board, grid_size)
+
+    def updater(self, grid_size):
+        n = grid_size
+        table = manhattan_table(n)
+
+        def update(board, value, tile, src, dst):
+            distances = table[tile]
+            value += distances[dst] - distances[src]
+            # Only the goal line of the moved tile can change its conflicts:
+            # compare that line with and without the moved tile in it
+            with_tile = []
+            without_tile = []
+            if src - dst == n or dst - src == n:
+                row = tile // n
+                joined = row == dst // n
+                if not joined and row != src // n:
+                    return value
+                position = row * n + dst % n
+                for i in range(row * n, row * n + n):
+                    t = tile if i == position else board[i]
+                    if t != -1 and t // n == row:
+                        with_tile.append(t % n)
+                        if i != position:
+                            without_tile.append(t % n)
+            else:
+                col = tile % n
+                joined = col == dst % n
+                if not joined and col != src % n:
+                    return value
+                position = dst - dst % n + col
+                for i in range(col, n * n, n):
+                    t = tile if i == position else board[i]
+                    if t != -1 and t % n == col:
+                        with_tile.append(t // n)
+                        if i != position:
+                            without_tile.append(t // n)
+            change = line_conflict(tuple(with_tile)) - line_conflict(tuple(without_tile))
+            return value + change if joined else value - change
+        return update
+
+
+def as_heuristic(heuristic):
+    """Return `heuristic` as a Heuristic object (None selects linear conflicts)"""
+    if heuristic is None:
+        return LinearConflictHeuristic()
+    if isinstance(heuristic, Heuristic):
+        return heuristic
+    return FunctionHeuristic(heuristic)
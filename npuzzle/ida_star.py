@@ -0,0 +1,87 @@
+"""Iterative-deepening A* solver
+
+Unlike a_star_solve, IDA* only keeps the current path in memory, so it can
+find optimal solutions for 4x4 boards without running out of memory.
+Heuristics are updated for the single tile that moves instead of being
+recomputed for the whole board.
+"""
+from .heuristics import as_heuristic
+from .state import OPPOSITE, move_table
+from .stats import CHECK_INTERVAL
+
+FOUND = -1
+INFINITY = float("inf")
+
+
+def bounded_search(board, grid_size, update, path, stats=None):
+    """Return search(blank, g, h, bound, banned), a depth-first search below an f-bound
+
+    `board` is searched in place and `path` receives the moves made from it.
+    search returns FOUND with the solution left in `path`, or the smallest f
+    above `bound` among the boards it cut off. `banned` is the direction that
+    would undo the move that reached the board.
+    """
+    moves = move_table(grid_size)
+    goal = list(range(grid_size * grid_size - 1)) + [-1]
+
+    def search(blank, g, h, bound, banned):
+        f = g + h
+        if f > bound:
+            return f
+        if h == 0 and board == goal:
+            return FOUND
+        if stats is not None:
+            stats.expanded += 1
+            stats.generated += len(moves[blank]) - (banned is not None)
+            if stats.expanded % CHECK_INTERVAL == 0:
+                stats.sample(g)  # Only the current path is kept
+                stats.check()
+        minimum = INFINITY
+        for tile_idx, direction in moves[blank]:
+            if direction == banned:
+                continue  # Never undo the previous move
+            tile = board[tile_idx]
+            board[blank] = tile
+            board[tile_idx] = -1
+            path.append((direction, tile_idx))
+            t = search(tile_idx, g + 1, update(board, h, tile, tile_idx, blank), bound, OPPOSITE[direction])
+            if t == FOUND:
+                return FOUND
+            path.pop()
+            board[tile_idx] = tile
+            board[blank] = -1
+            if t < minimum:
+                minimum = t
+        return minimum
+    return search
+
+
+def ida_star_solve(initial_board, grid_size, heuristic=None, stats=None):
+    """Solve a solvable puzzle optimally, returning a list of (direction, moved_tile)
+
+    `heuristic` must be admissible; it defaults to Manhattan distance plus
+    linear conflicts. A SearchStats passed as `stats` receives progress and
+    can stop the search.
+    """
+    heuristic = as_heuristic(heuristic)
+    n = grid_size
+    update = heuristic.updater(n)
+    if stats is not None:
+        update = stats.timed("heuristic", update)  # Unchanged unless profiling
+    board = list(initial_board)
+    path = []
+    search = bounded_search(board, n, update, path, stats)
+
+    h = heuristic(board, n)
+    bound = h
+    while True:
+        if stats is not None:
+            stats.bound = bound
+        t = search(board.index(-1), 0, h, bound, None)
+        if t == FOUND:
+            if stats is not None:
+                stats.sample(len(path))
+            return path
+        if t == INFINITY:
+            return None  # No solution found (shouldn't happen for solvable puzzles)
+        bound = t
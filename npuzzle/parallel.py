@@ -0,0 +1,146 @@
+"""Parallel IDA* over a pool of worker processes
+
+The parent expands the top of the search tree breadth-first, never undoing a
+move, until there are a few dozen boards per worker at one depth. Each of
+those boards is a work item: for every f-bound the items are handed to the
+workers one at a time through the pool's shared task queue, so a worker that
+finishes a small subtree simply takes the next item and hard subtrees do not
+hold the others up. A bound is finished once every item has returned the
+smallest f it cut off; the first item that reaches the goal under a bound
+gives an optimal solution, as in plain IDA*.
+
+Workers get the heuristic when they start. Where processes are forked they
+inherit it already loaded; where they are spawned (Windows, macOS) it is
+pickled, and a pattern database pickles as the description of its files,
+which each worker maps again. Either way the tables' pages are shared with
+the parent rather than copied. A heuristic handed to the workers must
+therefore be picklable under spawn.
+"""
+import multiprocessing
+import os
+import warnings
+
+from .heuristics import as_heuristic
+from .ida_star import FOUND, INFINITY, bounded_search, ida_star_solve
+from .state import OPPOSITE, move_table
+from .stats import SearchStats
+
+# Work items made per worker; more balance the load better but cost more
+# round trips at every bound
+ITEMS_PER_WORKER = 32
+
+# Deepest split, whatever the number of items
+MAX_SPLIT_DEPTH = 16
+
+# Seconds between two budget checks while waiting for the workers
+POLL_INTERVAL = 0.1
+
+# Heuristic updater and grid size of a worker process, set by _init_worker
+_worker = {}
+
+
+def _init_worker(grid_size, heuristic):
+    _worker["grid_size"] = grid_size
+    _worker["update"] = heuristic.updater(grid_size)
+
+
+def _search_item(task):
+    """Search one work item below a bound in a worker
+
+    Returns (item index, FOUND or the smallest f cut off, moves from the item's
+    board, expanded, generated).
+    """
+    index, board, blank, g, h, banned, bound = task
+    stats = SearchStats()
+    path = []
+    t = bounded_search(list(board), _worker["grid_size"], _worker["update"], path, stats)(blank, g, h, bound, banned)
+    return index, t, path if t == FOUND else None, stats.expanded, stats.generated
+
+
+def split_tree(initial_board, grid_size, update, h, count):
+    """Boards at the first depth with at least `count` of them
+
+    Returns a list of (board, blank, g, h, banned, moves from the start), one
+    per distinct board, or None if the goal turned up on the way (the
+    solution is then shorter than the split and plain IDA* is the way to go).
+    """
+    moves = move_table(grid_size)
+    goal = tuple(range(grid_size * grid_size - 1)) + (-1,)
+    start = tuple(initial_board)
+    if start == goal:
+        return None
+    level = [(start, start.index(-1), 0, h, None, ())]
+    while len(level) < count and level[0][2] < MAX_SPLIT_DEPTH:
+        seen = set()
+        next_level = []
+        for board, blank, g, h, banned, prefix in level:
+            for tile_idx, direction in moves[blank]:
+                if direction == banned:
+                    continue
+                child = list(board)
+                tile = child[tile_idx]
+                child[blank], child[tile_idx] = tile, -1
+                child = tuple(child)
+                if child == goal:
+                    return None
+                if child in seen:
+                    continue  # Same board at the same depth: same subtree
+                seen.add(child)
+                next_level.append((child, tile_idx, g + 1, update(child, h, tile, tile_idx, blank),
+                                   OPPOSITE[direction], prefix + ((direction, tile_idx),)))
+        level = next_level
+    return level
+
+
+def parallel_ida_star_solve(initial_board, grid_size, heuristic=None, stats=None, workers=None):
+    """Solve a solvable puzzle optimally on several cores, returning a list of (direction, moved_tile)
+
+    Same heuristics and SearchStats handling as ida_star_solve; `workers`
+    defaults to every core. Falls back to ida_star_solve where child processes
+    cannot be started (inside another pool's worker).
+    """
+    if multiprocessing.current_process().daemon:
+        warnings.warn("Parallel search cannot start processes from a daemon process, using IDA*")
+        return ida_star_solve(initial_board, grid_size, heuristic, stats)
+    heuristic = as_heuristic(heuristic)
+    workers = workers or os.cpu_count() or 1
+    update = heuristic.updater(grid_size)
+    h = heuristic(initial_board, grid_size)
+    items = split_tree(initial_board, grid_size, update, h, workers * ITEMS_PER_WORKER)
+    if items is None:
+        return ida_star_solve(initial_board, grid_size, heuristic, stats)
+    if stats is not None:
+        stats.sample(len(items))
+
+    pool = multiprocessing.Pool(workers, _init_worker, (grid_size, heuristic))
+    try:
+        bound = h
+        while True:
+            if stats is not None:
+                stats.bound = bound
+            tasks = [(index, board, blank, g, item_h, banned, bound)
+                     for index, (board, blank, g, item_h, banned, _) in enumerate(items)]
+            results = pool.imap_unordered(_search_item, tasks)
+            next_bound = INFINITY
+            for _ in tasks:
+                while True:
+                    try:
+                        index, t, path, expanded, generated = results.next(POLL_INTERVAL)
+                        break
+                    except multiprocessing.TimeoutError:
+                        if stats is not None:
+                            stats.check()
+                if stats is not None:
+                    stats.expanded += expanded
+                    stats.generated += generated
+                    stats.check()
+                if t == FOUND:
+                    return list(items[index][5]) + path
+                next_bound = min(next_bound, t)
+            if next_bound == INFINITY:
+                return None  # No solution found (shouldn't happen for solvable puzzles)
+            bound = next_bound
+    finally:
+        # Also stops the workers still searching once a solution is found
+        pool.terminate()
+        pool.join()
@@ -0,0 +1,219 @@
+"""Additive pattern database heuristics
+
+The tiles are split into disjoint groups (patterns). For each pattern a table
+stores how many moves of that pattern's tiles are needed to bring them home,
+ignoring the identity of every other tile. Only moves of the pattern's own
+tiles are counted, so the values of disjoint patterns can be added and the
+sum stays admissible.
+
+Tables are built once with a backward breadth-first search from the goal and
+saved as one byte per placement of the pattern tiles. Loading memory-maps the
+files, so starting a solver costs nothing and solver processes share pages.
+
+Build the tables for a grid size with:  python -m npuzzle.pdb 4
+"""
+import mmap
+import os
+import sys
+import time
+from functools import lru_cache
+from math import perm
+
+from .heuristics import Heuristic
+
+# Disjoint partitions of the tiles (tile numbers as used on the board)
+PATTERNS = {
+    3: ((0, 1, 3, 4), (2, 5, 6, 7)),
+    4: ((0, 1, 4, 5, 8), (2, 3, 6, 7, 11), (9, 10, 12, 13, 14)),
+    5: ((0, 1, 5, 6), (2, 3, 7, 8), (4, 9, 13, 14), (10, 11, 15, 16), (12, 17, 18, 19), (20, 21, 22, 23)),
+}
+
+UNSEEN = 255
+
+DATA_DIR = os.environ.get(
+    "NPUZZLE_DATA_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "puzzle_data"),
+)
+
+
+def pattern_rank(positions, cells):
+    """Index of a placement of distinct positions among all cells!/(cells-k)! placements"""
+    index = 0
+    for i, pos in enumerate(positions):
+        smaller = 0
+        for j in range(i):
+            if positions[j] < pos:
+                smaller += 1
+        index = index * (cells - i) + pos - smaller
+    return index
+
+
+def table_path(grid_size, pattern, data_dir=None):
+    """File name of the table for a pattern"""
+    name = f"pdb_{grid_size}x{grid_size}_{'-'.join(map(str, pattern))}.bin"
+    return os.path.join(data_dir or DATA_DIR, name)
+
+
+def build_table(grid_size, pattern):
+    """Build the table for one pattern with a backward breadth-first search
+
+    The search tracks the blank as well as the pattern tiles: moving the
+    blank through other cells is free, swapping it with a pattern tile costs
+    one move. The table keeps the cheapest value over all blank positions.
+    """
+    cells = grid_size * grid_size
+    k = len(pattern)
+    # During the search a state is encoded as base-`cells` digits (pattern
+    # tiles first, blank last), so a move changes the code by a constant
+    weights = [cells ** (k - i) for i in range(k)]
+    neighbours = []
+    for pos in range(cells):
+        row, col = pos // grid_size, pos % grid_size
+        neighbours.append([p for p, ok in ((pos - grid_size, row > 0), (pos + grid_size, row < grid_size - 1),
+                                           (pos - 1, col > 0), (pos + 1, col < grid_size - 1)) if ok])
+
+    seen = bytearray(cells ** (k + 1))
+    queued = bytearray(cells ** (k + 1))
+    table = bytearray([UNSEEN]) * perm(cells, k)
+    layer = [sum(tile * w for tile, w in zip(pattern, weights)) + cells - 1]
+    distance = 0
+    while layer:
+        stack = [code for code in layer if not seen[code]]
+        for code in stack:
+            seen[code] = 1
+        next_layer = []
+        while stack:
+            code = stack.pop()
+            positions = []
+            rest = code
+            for w in weights:
+                pos, rest = divmod(rest, w)
+                positions.append(pos)
+            blank = rest
+            index = pattern_rank(positions, cells)
+            if table[index] == UNSEEN:
+                table[index] = distance
+            for pos in neighbours[blank]:
+                if pos in positions:
+                    # A pattern tile slides into the blank: one move
+                    new_code = code + (blank - pos) * weights[positions.index(pos)] + pos - blank
+                    if not seen[new_code] and not queued[new_code]:
+                        queued[new_code] = 1
+                        next_layer.append(new_code)
+                else:
+                    new_code = code + pos - blank
+                    if not seen[new_code]:
+                        seen[new_code] = 1
+                        stack.append(new_code)
+        layer = next_layer
+        distance += 1
+    return table
+
+
+def save_table(path, table):
+    """Write a table atomically"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"  # Processes may build the same table at once
+    with open(tmp_path, "wb") as f:
+        f.write(table)
+    os.replace(tmp_path, path)
+
+
+def load_table(path, size):
+    """Memory-map a table read-only"""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size != size:
+            raise ValueError(f"{path} is not a valid pattern database (wrong size)")
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class PatternDatabase(Heuristic):
+    """Sum of disjoint pattern database values
+
+    Missing tables are built and saved when `build` is true, otherwise
+    FileNotFoundError is raised. A pattern database pickles as its grid
+    size, patterns and data directory, and maps the same files again when
+    unpickled, so processes started with spawn share the pages too.
+    """
+    name = "pdb"
+
+    def __init__(self, grid_size, patterns=None, data_dir=None, build=False):
+        if patterns is None and grid_size not in PATTERNS:
+            raise ValueError(f"No default patterns for {grid_size}x{grid_size} boards")
+        self.grid_size = grid_size
+        self.patterns = tuple(tuple(p) for p in (patterns or PATTERNS[grid_size]))
+        self.data_dir = data_dir or DATA_DIR
+        cells = grid_size * grid_size
+        tiles = [t for p in self.patterns for t in p]
+        if len(set(tiles)) != len(tiles) or not all(0 <= t < cells - 1 for t in tiles):
+            raise ValueError("Patterns must be disjoint groups of tiles")
+        self.tables = []
+        for pattern in self.patterns:
+            path = table_path(grid_size, pattern, self.data_dir)
+            if not os.path.exists(path):
+                if not build:
+                    raise FileNotFoundError(f"{path} is missing, build it with: python -m npuzzle.pdb {grid_size}")
+                save_table(path, build_table(grid_size, pattern))
+            self.tables.append(load_table(path, perm(cells, len(pattern))))
+        # Pattern number of every tile (None for tiles outside all patterns)
+        self.tile_pattern = [None] * (cells - 1)
+        for number, pattern in enumerate(self.patterns):
+            for tile in pattern:
+                self.tile_pattern[tile] = number
+
+    def __reduce__(self):
+        # The memory maps cannot be pickled; the files they map are all there is to them
+        return PatternDatabase, (self.grid_size, self.patterns, self.data_dir)
+
+    def __call__(self, board, grid_size):
+        if grid_size != self.grid_size:
+            raise ValueError(f"Pattern database is for {self.grid_size}x{self.grid_size} boards")
+        cells = grid_size * grid_size
+        return sum(table[pattern_rank([board.index(t) for t in pattern], cells)]
+                   for pattern, table in zip(self.patterns, self.tables))
+
+    def updater(self, grid_size):
+        if grid_size != self.grid_size:
+            raise ValueError(f"Pattern database is for {self.grid_size}x{self.grid_size} boards")
+        cells = grid_size * grid_size
+        patterns, tables, tile_pattern = self.patterns, self.tables, self.tile_pattern
+
+        def update(board, value, tile, src, dst):
+            number = tile_pattern[tile]
+            if number is None:
+                return value
+            pattern = patterns[number]
+            table = tables[number]
+            positions = [board.index(t) for t in pattern]
+            after = table[pattern_rank(positions, cells)]
+            positions[pattern.index(tile)] = src
+            return value + after - table[pattern_rank(positions, cells)]
+        return update
+
+
+@lru_cache(maxsize=None)
+def load_pattern_database(grid_size):
+    """Shared PatternDatabase for a grid size, using the default partition and data directory"""
+    return PatternDatabase(grid_size)
+
+
+def main(argv=None):
+    """Build the pattern databases for the grid sizes given on the command line"""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print(f"usage: python -m npuzzle.pdb GRID_SIZE [GRID_SIZE ...]  (available: {sorted(PATTERNS)})")
+        return 2
+    for grid_size in map(int, argv):
+        for pattern in PATTERNS[grid_size]:
+            path = table_path(grid_size, pattern)
+            if os.path.exists(path):
+                print(f"{path} already exists")
+                continue
+            start = time.time()
+            save_table(path, build_table(grid_size, pattern))
+            print(f"Built {path} in {time.time() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,368 @@
+"""Local HTTP/JSON solver service
+
+A small asyncio server (standard library only) answering on a TCP port or a
+Unix socket:
+
+    POST /solve     {"board": [...], "grid_size": 4, "solver": "A*", "timeout": 10}
+                    -> {"moves": [["up", 7], ...], "length": 12, "cached": false, ...}
+    POST /solvable  {"board": [...]} -> {"solvable": true}
+    GET  /metrics   request counts, throughput, latency percentiles, cache and pool use
+    GET  /health
+
+Boards are checked for solvability before any search. Solves run in a
+bounded process pool; a request for a board already being solved waits for
+that solve instead of starting another, and solutions are kept in an LRU
+cache. Every request has a deadline (the search stops with it), every
+worker a memory limit, and once `max_pending` solves are queued new ones are
+turned away with 503 rather than piling up. A worker that dies anyway (killed
+by the system, say) fails the solves in flight with 503 and the pool is
+started again.
+
+    python -m npuzzle.service --port 8765 --workers 4
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from .core import GRID_SIZES, SOLVERS, is_solvable, is_valid_board, solve
+from .stats import SearchCancelled, SearchStats, TIME_LIMIT_REACHED
+
+DEFAULT_PORT = 8765
+
+# Resident memory allowed per worker by default, in MB
+DEFAULT_MEMORY_LIMIT = 1024
+
+# Latencies kept for the percentiles in /metrics
+LATENCY_WINDOW = 10000
+
+# Largest request body accepted, in bytes
+MAX_BODY = 64 * 1024
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+           422: "Unprocessable Entity", 500: "Internal Server Error", 503: "Service Unavailable",
+           504: "Gateway Timeout"}
+
+
+class RequestError(Exception):
+    """Request that cannot be served, with the HTTP status to answer"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def solve_task(board, grid_size, solver, deadline, memory_limit=None):
+    """Solve one board in a pool worker; returns (moves or None, expanded, error)
+
+    `deadline` is a time.time() value, so time spent waiting in the pool's
+    queue counts against it. `memory_limit` caps the worker's resident
+    memory, in bytes.
+    """
+    if time.time() >= deadline:
+        return None, 0, TIME_LIMIT_REACHED
+    stats = SearchStats(time_limit=deadline - time.time(), memory_limit=memory_limit)
+    try:
+        moves = solve(board, grid_size, solver, stats)
+    except SearchCancelled as e:
+        return None, stats.expanded, str(e)
+    except MemoryError:
+        return None, stats.expanded, "Out of memory"
+    return moves, stats.expanded, None if moves is not None else "No solution found"
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a sorted list (None if empty)"""
+    if not values:
+        return None
+    return round(values[min(len(values) - 1, max(0, math.ceil(fraction * len(values)) - 1))], 6)
+
+
+class SolverService:
+    """Solves, coalescing, caching and metrics behind the HTTP handler"""
+
+    def __init__(self, workers=None, max_pending=64, cache_size=10000, timeout=30, max_timeout=300,
+                 memory_limit=DEFAULT_MEMORY_LIMIT * 1024 ** 2):
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = ProcessPoolExecutor(self.workers)
+        self.memory_limit = memory_limit  # Bytes per worker, or None
+        self.max_pending = max_pending
+        self.cache_size = cache_size
+        self.timeout = timeout
+        self.max_timeout = max_timeout
+        self.cache = OrderedDict()  # (solver, grid_size, board) -> moves
+        self.in_flight = {}  # (solver, grid_size, board) -> future of the running solve
+        self.started = time.monotonic()
+        self.counts = {}  # status -> responses
+        self.solves = 0
+        self.cache_hits = 0
+        self.coalesced = 0
+        self.rejected = 0
+        self.restarts = 0
+        self.expanded = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)  # (finish time, seconds) of /solve requests
+
+    def close(self):
+        for future in self.in_flight.values():
+            future.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _restart(self, executor):
+        """Replace a broken pool, unless that was done already; its solves are all lost"""
+        if executor is not self.executor:
+            return
+        self.restarts += 1
+        self.in_flight.clear()
+        executor.shutdown(wait=False, cancel_futures=True)
+        self.executor = ProcessPoolExecutor(self.workers)
+
+    @staticmethod
+    def parse_board(request):
+        board = request.get("board")
+        if not isinstance(board, list) or not all(type(tile) is int for tile in board):
+            raise RequestError(400, "'board' must be a list of tile numbers with -1 for the blank")
+        grid_size = request.get("grid_size") or math.isqrt(len(board))
+        if type(grid_size) is not int or grid_size not in GRID_SIZES:
+            raise RequestError(400, f"'grid_size' must be from {GRID_SIZES[0]} to {GRID_SIZES[-1]}")
+        if not is_valid_board(board, grid_size):
+            raise RequestError(400, "'board' must hold 0..n*n-2 and -1 once each")
+        return board, grid_size
+
+    async def solvable(self, request):
+        board, grid_size = self.parse_board(request)
+        return {"solvable": is_solvable(board, grid_size)}
+
+    async def solve(self, request):
+        board, grid_size = self.parse_board(request)
+        solver = request.get("solver", "A*")
+        if solver not in SOLVERS:
+            raise RequestError(400, f"Unknown solver {solver!r}, expected one of {SOLVERS}")
+        timeout = request.get("timeout", self.timeout)
+        if type(timeout) not in (int, float) or timeout <= 0:
+            raise RequestError(400, "'timeout' must be a positive number of seconds")
+        timeout = min(timeout, self.max_timeout)
+        if not is_solvable(board, grid_size):
+            raise RequestError(422, "Board is not solvable")
+
+        key = (solver, grid_size, tuple(board))
+        moves = self.cache.get(key)
+        if moves is not None:
+            self.cache.move_to_end(key)
+            self.cache_hits += 1
+            return {"moves": moves, "length": len(moves), "cached": True, "coalesced": False}
+
+        future = self.in_flight.get(key)
+        coalesced = future is not None
+        if coalesced:
+            self.coalesced += 1
+        elif len(self.in_flight) >= self.max_pending:
+            self.rejected += 1
+            raise RequestError(503, "Too many solves pending, try again later")
+        executor = self.executor
+        try:
+            if not coalesced:
+                # The worker stops the search at the deadline of the request that started it
+                future = asyncio.get_running_loop().run_in_executor(
+                    executor, solve_task, board, grid_size, solver, time.time() + timeout, self.memory_limit)
+                self.in_flight[key] = future
+                future.add_done_callback(lambda done: self._finished(key, done))
+                self.solves += 1
+            # Shielded, so one caller giving up does not cancel the solve for the others
+            moves, _, error = await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            raise RequestError(504, f"No solution within {timeout:g}s") from None
+        except BrokenProcessPool:
+            self._restart(executor)
+            raise RequestError(503, "A solver process died, try again") from None
+        except Exception as e:  # The task itself failed
+            raise RequestError(500, f"Solver failed ({e!r})") from None
+        if moves is None:
+            raise RequestError(504 if error == TIME_LIMIT_REACHED else 500, error)
+        moves = [list(move) for move in moves]
+        return {"moves": moves, "length": len(moves), "cached": False, "coalesced": coalesced}
+
+    def _finished(self, key, future):
+        if self.in_flight.get(key) is future:  # Not a solve from a pool replaced since
+            del self.in_flight[key]
+        if future.cancelled() or future.exception() is not None:
+            return
+        moves, expanded, _ = future.result()
+        self.expanded += expanded
+        if moves is not None and self.cache_size:
+            self.cache[key] = [list(move) for move in moves]
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+
+    def record(self, status, seconds, timed):
+        self.counts[status] = self.counts.get(status, 0) + 1
+        if timed:
+            self.latencies.append((time.monotonic(), seconds))
+
+    async def metrics(self, request=None):
+        now = time.monotonic()
+        uptime = now - self.started
+        recent = sum(1 for finished, _ in self.latencies if now - finished <= 60)
+        latencies = sorted(seconds for _, seconds in self.latencies)
+        return {
+            "uptime": round(uptime, 3),
+            "responses": {str(status): count for status, count in sorted(self.counts.items())},
+            # Solve requests answered per second over the last minute
+            "throughput": round(recent / min(60, uptime), 3) if uptime > 0 else None,
+            "latency": {name: percentile(latencies, fraction)
+                        for name, fraction in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("max", 1))},
+            "solves": self.solves,
+            "expanded": self.expanded,
+            "cache_hits": self.cache_hits,
+            "cache_entries": len(self.cache),
+            "coalesced": self.coalesced,
+            "rejected": self.rejected,
+            "pool_restarts": self.restarts,
+            "in_flight": len(self.in_flight),
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+        }
+
+    async def health(self, request=None):
+        return {"status": "ok"}
+
+
+async def read_line(reader):
+    try:
+        return await reader.readline()
+    except ValueError:  # Longer than the reader's limit
+        raise RequestError(413, "Request line or header too long") from None
+
+
+async def read_request(reader):
+    """Return (method, path, headers, body) of the next request, or None at the end of the connection"""
+    line = await read_line(reader)
+    if not line.strip():
+        return None
+    try:
+        method, path, _ = line.decode("latin-1").split()
+    except ValueError:
+        raise RequestError(400, "Malformed request line") from None
+    headers = {}
+    while True:
+        line = await read_line(reader)
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        length = -1
+    if length < 0:
+        raise RequestError(400, "Bad Content-Length")
+    if length > MAX_BODY:
+        raise RequestError(413, "Request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return method, path, headers, body
+
+
+def write_response(writer, status, payload, keep_alive):
+    body = json.dumps(payload).encode()
+    head = [f"HTTP/1.1 {status} {REASONS.get(status, '')}", "Content-Type: application/json",
+            f"Content-Length: {len(body)}", f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+    if status == 503:
+        head.append("Retry-After: 1")
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + body)
+
+
+def make_handler(service):
+    routes = {
+        ("POST", "/solve"): service.solve,
+        ("POST", "/solvable"): service.solvable,
+        ("GET", "/metrics"): service.metrics,
+        ("GET", "/health"): service.health,
+    }
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                start = time.monotonic()
+                keep_alive = False
+                path = None
+                try:
+                    request = await read_request(reader)
+                    if request is None:
+                        break
+                    method, path, headers, body = request
+                    keep_alive = headers.get("connection", "").lower() != "close"
+                    route = routes.get((method, path))
+                    if route is None:
+                        raise RequestError(405 if any(p == path for _, p in routes) else 404,
+                                           f"No route for {method} {path}")
+                    try:
+                        payload = json.loads(body) if body else {}
+                    except ValueError:
+                        raise RequestError(400, "Body is not valid JSON") from None
+                    if not isinstance(payload, dict):
+                        raise RequestError(400, "Body must be a JSON object")
+                    status, response = 200, await route(payload)
+                except RequestError as e:
+                    status, response = e.status, {"error": str(e)}
+                response_time = time.monotonic() - start
+                if status == 200 and path == "/solve":
+                    response["elapsed"] = round(response_time, 6)
+                service.record(status, response_time, path == "/solve")
+                write_response(writer, status, response, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    return handle
+
+
+async def serve(service, host="127.0.0.1", port=DEFAULT_PORT, unix=None):
+    handler = make_handler(service)
+    if unix:
+        server = await asyncio.start_unix_server(handler, unix)
+        where = unix
+    else:
+        server = await asyncio.start_server(handler, host, port)
+        where = f"http://{host}:{port}"
+    print(f"Solver service on {where} with {service.workers} workers", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m npuzzle.service", description=__doc__.split("\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", help="listen on this Unix socket instead of a TCP port")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="solver processes (default: all cores)")
+    parser.add_argument("--max-pending", type=int, default=64,
+                        help="solves queued or running before new ones get 503 (default: 64)")
+    parser.add_argument("--cache-size", type=int, default=10000, help="solutions kept in memory (default: 10000)")
+    parser.add_argument("--timeout", type=float, default=30, help="default deadline per request, in seconds")
+    parser.add_argument("--max-timeout", type=float, default=300, help="longest deadline a request may ask for")
+    parser.add_argument("--memory-limit", type=float, default=DEFAULT_MEMORY_LIMIT,
+                        help=f"resident memory allowed per worker, in MB (default: {DEFAULT_MEMORY_LIMIT}, 0 for none)")
+    args = parser.parse_args(argv)
+    memory_limit = int(args.memory_limit * 1024 * 1024) if args.memory_limit else None
+    service = SolverService(args.workers, args.max_pending, args.cache_size, args.timeout, args.max_timeout,
+                            memory_limit)
+    try:
+        asyncio.run(serve(service, args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
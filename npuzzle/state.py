@@ -0,0 +1,99 @@
+"""Compact board encoding and move tables shared by the solvers
+
+A board is packed into a single int with a fixed number of bits per cell
+(4 bits up to 4x4, 5 for 5x5, 6 for 6x6), the blank being stored as the
+highest tile number. Packed boards hash and compare as plain ints and take a
+fraction of the memory of a list or tuple.
+"""
+from functools import lru_cache
+
+# Directions as used by move_tile: the tile moves, the blank goes the other way
+DIRECTIONS = ("up", "down", "left", "right")
+
+# Direction that undoes each move
+OPPOSITE = {"up": "down", "down": "up", "left": "right", "right": "left", None: None}
+
+
+def cell_bits(grid_size):
+    """Number of bits used per cell"""
+    return (grid_size * grid_size - 1).bit_length()
+
+
+def pack_board(board, grid_size):
+    """Pack a board (list with -1 for the blank) into an int"""
+    bits = cell_bits(grid_size)
+    blank = grid_size * grid_size - 1
+    state = 0
+    for tile in reversed(board):
+        state = (state << bits) | (blank if tile == -1 else tile)
+    return state
+
+
+def unpack_board(state, grid_size):
+    """Unpack an int produced by pack_board back into a board list"""
+    bits = cell_bits(grid_size)
+    mask = (1 << bits) - 1
+    blank = grid_size * grid_size - 1
+    board = []
+    for _ in range(grid_size * grid_size):
+        tile = state & mask
+        board.append(-1 if tile == blank else tile)
+        state >>= bits
+    return board
+
+
+@lru_cache(maxsize=None)
+def goal_state(grid_size):
+    """Packed solved board"""
+    return pack_board(list(range(grid_size * grid_size - 1)) + [-1], grid_size)
+
+
+@lru_cache(maxsize=None)
+def move_table(grid_size):
+    """Return, for each blank index, the (tile index, direction) moves available"""
+    table = []
+    for blank in range(grid_size * grid_size):
+        row, col = blank // grid_size, blank % grid_size
+        moves = []
+        if row < grid_size - 1:
+            moves.append((blank + grid_size, "up"))
+        if row > 0:
+            moves.append((blank - grid_size, "down"))
+        if col < grid_size - 1:
+            moves.append((blank + 1, "left"))
+        if col > 0:
+            moves.append((blank - 1, "right"))
+        table.append(tuple(moves))
+    return tuple(table)
+
+
+def blank_offset(direction, grid_size):
+    """How far the blank index moves for a direction"""
+    return {"up": grid_size, "down": -grid_size, "left": 1, "right": -1}[direction]
+
+
+def slide(state, tile_idx, blank, grid_size):
+    """Packed state after the tile at tile_idx slides into the blank"""
+    bits = cell_bits(grid_size)
+    tile = (state >> (tile_idx * bits)) & ((1 << bits) - 1)
+    swap = tile ^ (grid_size * grid_size - 1)
+    return state ^ (swap << (tile_idx * bits)) ^ (swap << (blank * bits))
+
+
+def rebuild_path(moves, state, blank, grid_size):
+    """Rebuild the (direction, moved_tile) path that reached a packed state
+
+    `moves` maps every packed state on the path to the direction of the move
+    that reached it, and the start state to None.
+    """
+    path = []
+    direction = moves[state]
+    while direction is not None:
+        path.append((direction, blank))
+        # Undo the move: the tile that moved into the old blank slides back
+        parent_blank = blank - blank_offset(direction, grid_size)
+        state = slide(state, parent_blank, blank, grid_size)
+        blank = parent_blank
+        direction = moves[state]
+    path.reverse()
+    return path
@@ -0,0 +1,187 @@
+"""Progress reporting, cancellation and budgets for running searches"""
+import os
+import sys
+import time
+
+# Expansions between two budget checks
+CHECK_INTERVAL = 1024
+
+# Reasons given by SearchCancelled
+CANCELLED = "Cancelled"
+TIME_LIMIT_REACHED = "Time limit reached"
+MEMORY_LIMIT_REACHED = "Memory limit reached"
+
+
+class SearchCancelled(Exception):
+    """Raised inside a search when it is cancelled or runs out of budget"""
+
+
+def _process_memory_counters():
+    """PROCESS_MEMORY_COUNTERS of this process on Windows, or None"""
+    if sys.platform != "win32":
+        return None
+    import ctypes
+    from ctypes import wintypes
+
+    class ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                    ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+    counters = ProcessMemoryCounters()
+    counters.cb = ctypes.sizeof(counters)
+    process = ctypes.windll.kernel32.GetCurrentProcess()
+    if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+        return counters
+    return None
+
+
+def current_rss():
+    """Resident memory of this process in bytes, or None if it cannot be read"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    counters = _process_memory_counters()
+    return counters.WorkingSetSize if counters is not None else None
+
+
+def peak_rss():
+    """Highest resident memory of this process so far in bytes, or None if unknown"""
+    try:
+        import resource
+    except ImportError:
+        counters = _process_memory_counters()
+        return counters.PeakWorkingSetSize if counters is not None else None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class SearchStats:
+    """Counters shared between a running search and whoever is watching it
+
+    The search updates the counters as it goes and calls `check` every
+    CHECK_INTERVAL expansions. `check` raises SearchCancelled once `cancel`
+    has been called or the time or memory budget is used up. Other threads
+    may read the counters at any time.
+
+    Instrumentation costs nothing unless asked for: with `profile` the
+    solvers also time their phases (heuristic, open list, move generation)
+    into `timings`, and a `callback` is called with the stats at every check.
+    """
+
+    def __init__(self, time_limit=None, memory_limit=None, profile=False, callback=None):
+        self.expanded = 0
+        self.generated = 0
+        self.duplicates = 0  # Boards dropped because they were already seen
+        self.bound = None  # Current f-bound (IDA*) or f of the last expanded node (A*)
+        self.frontier = 0  # Open list size (the current depth for IDA*)
+        self.peak_frontier = 0  # Largest frontier seen at a check
+        self.closed = 0  # Boards kept as seen, sampled at the checks
+        self.peak_closed = 0
+        self.time_limit = time_limit  # Seconds
+        self.memory_limit = memory_limit  # Bytes of resident memory
+        self.timings = {} if profile else None  # Seconds per phase
+        self.callback = callback
+        self.start_time = time.monotonic()
+        self.end_time = None
+        self.stop_reason = None
+
+    @property
+    def elapsed(self):
+        return (self.end_time or time.monotonic()) - self.start_time
+
+    def cancel(self, reason=CANCELLED):
+        """Ask the search to stop at its next check"""
+        self.stop_reason = reason
+
+    def check(self):
+        """Raise SearchCancelled if the search should stop"""
+        if self.callback is not None:
+            self.callback(self)
+        if self.stop_reason is None:
+            if self.time_limit is not None and self.elapsed > self.time_limit:
+                self.stop_reason = TIME_LIMIT_REACHED
+            elif self.memory_limit is not None:
+                rss = current_rss()
+                if rss is not None and rss > self.memory_limit:
+                    self.stop_reason = MEMORY_LIMIT_REACHED
+        if self.stop_reason is not None:
+            raise SearchCancelled(self.stop_reason)
+
+    def sample(self, frontier, closed=None):
+        """Record the current open and closed sizes"""
+        self.frontier = frontier
+        self.peak_frontier = max(self.peak_frontier, frontier)
+        if closed is not None:
+            self.closed = closed
+            self.peak_closed = max(self.peak_closed, closed)
+
+    def finish(self):
+        """Stop the clock once the search is over"""
+        if self.end_time is None:
+            self.end_time = time.monotonic()
+
+    def timed(self, phase, function):
+        """Wrap `function` so the time spent in it adds to a phase
+
+        Returns `function` itself when not profiling, so solvers can wrap
+        their hot calls unconditionally.
+        """
+        if self.timings is None:
+            return function
+        timings = self.timings
+        timings.setdefault(phase, 0.0)
+        clock = time.perf_counter
+
+        def timed_function(*args):
+            start = clock()
+            result = function(*args)
+            timings[phase] += clock() - start
+            return result
+        return timed_function
+
+    def phase(self, phase):
+        """Context manager adding the time spent in a block to a phase (a no-op unless profiling)"""
+        return _Phase(self.timings, phase)
+
+    def to_dict(self):
+        """Plain dict of the counters, for JSON export"""
+        return {
+            "expanded": self.expanded,
+            "generated": self.generated,
+            "duplicates": self.duplicates,
+            "bound": self.bound,
+            "peak_frontier": self.peak_frontier,
+            "peak_closed": self.peak_closed,
+            "elapsed": round(self.elapsed, 6),
+            "nodes_per_second": round(self.expanded / self.elapsed) if self.elapsed > 0 else None,
+            "timings": {phase: round(seconds, 6) for phase, seconds in self.timings.items()}
+            if self.timings is not None else None,
+            "stop_reason": self.stop_reason,
+        }
+
+    def save_json(self, path, **extra):
+        """Write to_dict() plus any extra fields (board, solver, ...) to a JSON file"""
+        import json  # Only needed here, and slow to import for every search
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({**extra, "stats": self.to_dict()}, f, indent=1)
+
+
+class _Phase:
+    def __init__(self, timings, phase):
+        self.timings = timings
+        self.phase = phase
+
+    def __enter__(self):
+        if self.timings is not None:
+            self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        if self.timings is not None:
+            self.timings[self.phase] = self.timings.get(self.phase, 0.0) + time.perf_counter() - self.start
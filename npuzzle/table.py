@@ -0,0 +1,136 @@
+"""Perfect distance tables for boards small enough to enumerate
+
+A breadth-first search back from the goal visits every solvable 3x3 board
+(181,440 of them) and stores its exact distance in one byte per board,
+indexed by a rank over the solvable boards only. The table is saved next to the
+pattern databases and memory-mapped, so solving a board is a greedy walk that
+looks up the neighbours of each state and follows one that is a step closer.
+"""
+import os
+import sys
+import time
+from collections import deque
+from functools import lru_cache
+from math import factorial
+
+from .pdb import DATA_DIR, UNSEEN, load_table, save_table
+from .state import move_table
+
+# Grid sizes small enough for a complete table
+TABLE_SIZES = (2, 3)
+
+
+def board_rank(board, grid_size):
+    """Index of a solvable board among the cells!/2 solvable ones, or None if it is unsolvable
+
+    The blank's index, then the lexicographic rank of the tiles in reading
+    order without its last two digits: the last is always 0, and for a
+    given blank only one of the two orders of the last two tiles is
+    solvable. Every move swaps the blank with a tile and moves it one cell,
+    so a board is solvable exactly when the parity of its cells' permutation
+    (the tiles' inversions plus the tiles after the blank) matches that of
+    the blank's distance from its home.
+    """
+    cells = grid_size * grid_size
+    blank = board.index(-1)
+    tiles = [tile for tile in board if tile != -1]
+    rank = 0
+    parity = cells - 1 - blank
+    for i in range(cells - 2):
+        tile = tiles[i]
+        smaller = 0
+        for later in tiles[i + 1:]:
+            if later < tile:
+                smaller += 1
+        parity += smaller
+        if i < cells - 3:
+            rank = rank * (cells - 1 - i) + smaller
+    distance = (grid_size - 1 - blank // grid_size) + (grid_size - 1 - blank % grid_size)
+    if (parity - distance) % 2:
+        return None
+    return blank * (factorial(cells - 1) // 2) + rank
+
+
+def table_size(grid_size):
+    """Number of solvable boards, one table entry each"""
+    return factorial(grid_size * grid_size) // 2
+
+
+def table_path(grid_size, data_dir=None):
+    """File name of the distance table for a grid size"""
+    return os.path.join(data_dir or DATA_DIR, f"distances_{grid_size}x{grid_size}.bin")
+
+
+def build_distance_table(grid_size):
+    """Distance to the goal of every solvable board, by board_rank"""
+    cells = grid_size * grid_size
+    moves = move_table(grid_size)
+    table = bytearray([UNSEEN]) * table_size(grid_size)
+    goal = tuple(range(cells - 1)) + (-1,)
+    table[board_rank(goal, grid_size)] = 0
+    queue = deque([(goal, cells - 1, 0)])
+    while queue:
+        board, blank, distance = queue.popleft()
+        for tile_idx, _ in moves[blank]:
+            child = list(board)
+            child[blank], child[tile_idx] = child[tile_idx], -1
+            index = board_rank(child, grid_size)
+            if table[index] == UNSEEN:
+                table[index] = distance + 1
+                queue.append((tuple(child), tile_idx, distance + 1))
+    return table
+
+
+@lru_cache(maxsize=None)
+def load_distance_table(grid_size, data_dir=None):
+    """Memory-mapped distance table, built and saved on first use"""
+    if grid_size not in TABLE_SIZES:
+        raise ValueError(f"No distance table for {grid_size}x{grid_size} boards")
+    path = table_path(grid_size, data_dir)
+    size = table_size(grid_size)
+    # Also replaces tables from before only solvable boards were ranked, twice this size
+    if not os.path.exists(path) or os.path.getsize(path) != size:
+        save_table(path, build_distance_table(grid_size))
+    return load_table(path, size)
+
+
+def table_distance(board, grid_size):
+    """Exact number of moves needed to solve a board (None if it is unsolvable)"""
+    rank = board_rank(board, grid_size)
+    return None if rank is None else load_distance_table(grid_size)[rank]
+
+
+def table_solve(initial_board, grid_size):
+    """Optimal solution read from the distance table, as (direction, moved_tile) moves"""
+    table = load_distance_table(grid_size)
+    moves = move_table(grid_size)
+    board = list(initial_board)
+    blank = board.index(-1)
+    rank = board_rank(board, grid_size)
+    if rank is None:
+        return None
+    distance = table[rank]
+    path = []
+    while distance > 0:
+        for tile_idx, direction in moves[blank]:
+            board[blank], board[tile_idx] = board[tile_idx], -1
+            if table[board_rank(board, grid_size)] == distance - 1:
+                break
+            board[tile_idx], board[blank] = board[blank], -1
+        path.append((direction, tile_idx))
+        blank = tile_idx
+        distance -= 1
+    return path
+
+
+def main():
+    """Build the distance tables"""
+    for grid_size in TABLE_SIZES:
+        start = time.time()
+        load_distance_table(grid_size)
+        print(f"{table_path(grid_size)} ready in {time.time() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
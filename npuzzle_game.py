@@ -0,0 +1,682 @@
+"""N-Puzzle game: slide the tiles of a picture back in place, or let a solver do it
+
+A thin pygame front end over the npuzzle package. Nothing happens on import;
+run it with  python npuzzle_game.py
+"""
+import pygame
+import os
+import sys
+import random
+import time
+from collections import OrderedDict
+from PIL import Image
+
+from npuzzle.anytime import splice_path
+from npuzzle.background import BackgroundSolver
+from npuzzle.board import Board
+from npuzzle.cache import default_cache
+from npuzzle.core import SOLVERS, create_solvable_board, move_tile, is_solved, solve
+from npuzzle.pdb import DATA_DIR
+
+# Initial game settings
+INITIAL_GRID_SIZE = 3  # Default 3x3 grid
+TILE_SIZE = 150
+CONTROLS_WIDTH = 200  # Width for controls panel
+
+# Colors
+WHITE = (255, 255, 255)
+BLACK = (0, 0, 0)
+BLUE = (0, 0, 255)
+GREEN = (0, 255, 0)
+RED = (255, 0, 0)
+YELLOW = (255, 255, 0)
+GRAY = (200, 200, 200)
+DARK_GRAY = (120, 120, 120)
+LIGHT_BLUE = (173, 216, 230)
+
+# Solvers selectable with a right click on the Solve button
+SOLVER_NAMES = list(SOLVERS)
+
+# Suboptimality bounds of the Fast solver, cycled with the W key
+FAST_BOUNDS = (1.5, 2, 3, 5)
+
+# Playback speeds of AI solutions in moves per second, cycled with the S key;
+# None plays the whole solution at once
+PLAYBACK_SPEEDS = (1, 3, 10, 30, None)
+
+# Frame rates while something moves on screen; an idle window only redraws on events
+ANIMATION_FPS = 60
+SEARCH_FPS = 10  # Enough for the progress text
+
+# Budget for a single solve; the search stops once either is used up
+SOLVE_TIME_LIMIT = 120  # Seconds
+SOLVE_MEMORY_LIMIT = 2 * 1024 ** 3  # Bytes
+
+# Search statistics of every solve are saved here while the overlay (I key) is on
+STATS_DIR = os.path.join(DATA_DIR, "stats")
+
+# Picture cut into tiles, next to this file
+IMAGE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "puzzle_image.jpg")
+
+# Display surface, created by main()
+screen = None
+
+# Render caches: fonts by size and rendered text by (text, size, color)
+font_cache = {}
+text_cache = OrderedDict()
+TEXT_CACHE_SIZE = 128  # Enough for every label; changing texts (progress) get evicted
+
+# Image caches: decoded source images by path and tile sets by (path, grid size, tile size)
+source_images = {}
+tile_cache = OrderedDict()
+TILE_CACHE_SIZE = 4
+MAX_PUZZLE_WIDTH = 600  # Largest board drawn, whatever the grid size
+
+
+def get_font(size):
+    """Return the default system font at a size, creating it only once"""
+    font = font_cache.get(size)
+    if font is None:
+        font = font_cache[size] = pygame.font.SysFont(None, size)
+    return font
+
+
+def render_text(text, size, color):
+    """Render text, reusing the surface from an earlier frame when possible"""
+    key = (text, size, color)
+    surface = text_cache.get(key)
+    if surface is None:
+        surface = text_cache[key] = get_font(size).render(text, True, color)
+        if len(text_cache) > TEXT_CACHE_SIZE:
+            text_cache.popitem(last=False)
+    else:
+        text_cache.move_to_end(key)
+    return surface
+
+
+class FrameTimer:
+    """Smoothed time spent drawing a frame"""
+    def __init__(self, smoothing=0.1):
+        self.smoothing = smoothing
+        self.average = None
+
+    def add(self, seconds):
+        if self.average is None:
+            self.average = seconds
+        else:
+            self.average += (seconds - self.average) * self.smoothing
+
+# Define button class
+class Button:
+    def __init__(self, x, y, width, height, text, color, hover_color):
+        self.rect = pygame.Rect(x, y, width, height)
+        self.text = text
+        self.color = color
+        self.hover_color = hover_color
+        self.current_color = color
+        
+    def draw(self):
+        # Draw button
+        pygame.draw.rect(screen, self.current_color, self.rect, border_radius=5)
+        pygame.draw.rect(screen, BLACK, self.rect, 2, border_radius=5)
+        
+        # Draw text (rendered again only when the label changes)
+        text_surface = render_text(self.text, 30, BLACK)
+        text_rect = text_surface.get_rect(center=self.rect.center)
+        screen.blit(text_surface, text_rect)
+        
+    def is_hovered(self, pos):
+        return self.rect.collidepoint(pos)
+    
+    def update(self, mouse_pos):
+        if self.is_hovered(mouse_pos):
+            self.current_color = self.hover_color
+        else:
+            self.current_color = self.color
+
+# Define text input box class
+class InputBox:
+    def __init__(self, x, y, w, h, text=''):
+        self.rect = pygame.Rect(x, y, w, h)
+        self.color = BLACK
+        self.text = text
+        self.font = get_font(30)
+        self.txt_surface = self.font.render(text, True, self.color)
+        self.active = False
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            # Toggle active if clicked on the input box
+            if self.rect.collidepoint(event.pos):
+                self.active = not self.active
+            else:
+                self.active = False
+            # Change color based on active state
+            self.color = BLUE if self.active else BLACK
+        if event.type == pygame.KEYDOWN:
+            if self.active:
+                if event.key == pygame.K_RETURN:
+                    return self.text  # Return the text when Enter is pressed
+                elif event.key == pygame.K_BACKSPACE:
+                    self.text = self.text[:-1]
+                else:
+                    # Only allow numeric input
+                    if event.unicode.isdigit():
+                        self.text += event.unicode
+                # Re-render the text
+                self.txt_surface = self.font.render(self.text, True, self.color)
+        return None
+
+    def update(self):
+        # Resize the box if the text is too long
+        width = max(60, self.txt_surface.get_width()+10)
+        self.rect.w = width
+
+    def draw(self, screen):
+        # Draw the text
+        screen.blit(self.txt_surface, (self.rect.x+5, self.rect.y+5))
+        # Draw the rect
+        pygame.draw.rect(screen, self.color, self.rect, 2, border_radius=5)
+
+
+def load_source_image(image_path):
+    """Decode an image once, no larger than the largest board needs (None if it cannot be read)"""
+    if image_path not in source_images:
+        try:
+            img = Image.open(image_path)
+            # For JPEGs, let the decoder scale big photos down by 2, 4 or 8 while decoding
+            img.draft("RGB", (MAX_PUZZLE_WIDTH, MAX_PUZZLE_WIDTH))
+            img = img.convert("RGB")
+        except (OSError, Image.DecompressionBombError) as e:
+            print(f"Could not load {image_path} ({e}), using colored tiles")
+            img = None
+        source_images[image_path] = img
+    return source_images[image_path]
+
+
+def load_and_split_image(image_path, grid_size, tile_size):
+    """Load an image and split it into tiles
+
+    The tiles are subsurfaces of one display-format surface holding the whole
+    scaled image, so they share its pixels. Tile sets are kept for the last
+    few grid sizes, so switching back to one of them costs nothing.
+    """
+    key = (image_path, grid_size, tile_size)
+    tiles = tile_cache.get(key)
+    if tiles is not None:
+        tile_cache.move_to_end(key)
+        return tiles
+
+    puzzle_width = grid_size * tile_size
+    img = load_source_image(image_path)
+    if img is not None:
+        img = img.resize((puzzle_width, puzzle_width), reducing_gap=2.0)  # Use puzzle_width for square image
+        surface = pygame.image.frombuffer(img.tobytes(), img.size, "RGB").convert()
+    else:
+        # If no image, create colored tiles as fallback
+        surface = pygame.Surface((puzzle_width, puzzle_width)).convert()
+        for i in range(grid_size * grid_size):
+            color = (random.randint(0, 255), random.randint(0, 255), random.randint(0, 255))
+            surface.fill(color, ((i % grid_size) * tile_size, (i // grid_size) * tile_size, tile_size, tile_size))
+
+    tiles = [surface.subsurface((x * tile_size, y * tile_size, tile_size, tile_size))
+             for y in range(grid_size) for x in range(grid_size)]
+    tile_cache[key] = tiles
+    if len(tile_cache) > TILE_CACHE_SIZE:
+        tile_cache.popitem(last=False)
+    return tiles
+
+
+def draw_board(board, tiles, buttons, input_box, grid_size, tile_size, solving=False, current_move=None, solved=False,
+               searching=False, status_lines=(), frame_time=None, stats_lines=(), slide=None):
+    """Draw the current board state and GUI elements (tiles are surfaces from load_and_split_image)
+
+    `slide` is (tile index, blank index, progress) for a tile part of the way
+    into the blank.
+    """
+    puzzle_width = grid_size * tile_size
+    screen.fill(WHITE)
+    
+    # Draw right panel with controls (light gray background)
+    pygame.draw.rect(screen, GRAY, (puzzle_width, 0, CONTROLS_WIDTH, puzzle_width))
+    
+    # Draw vertical separator line
+    pygame.draw.line(screen, BLACK, (puzzle_width, 0), (puzzle_width, puzzle_width), 2)
+    
+    # Draw the puzzle board (left side)
+    for i, tile_num in enumerate(board):
+        if tile_num == -1:
+            continue  # Skip empty tile
+
+        row = i // grid_size
+        col = i % grid_size
+        x, y = col * tile_size, row * tile_size
+        if slide is not None and i == slide[0]:
+            _, blank, progress = slide
+            x += round((blank % grid_size - col) * tile_size * progress)
+            y += round((blank // grid_size - row) * tile_size * progress)
+
+        tile_surface = tiles[tile_num]
+
+        # Highlight the tile being moved by AI
+        if solving and i == current_move:
+            highlight = pygame.Surface((tile_size, tile_size))
+            highlight.fill(GREEN)
+            screen.blit(highlight, (x, y))
+
+        screen.blit(tile_surface, (x, y))
+
+        # Draw tile border
+        border_color = RED if solving and i == current_move else BLACK
+        pygame.draw.rect(
+            screen, border_color,
+            (x, y, tile_size, tile_size),
+            2  # Margin
+        )
+
+    # Draw all buttons
+    for button in buttons:
+        button.draw()
+        
+    # Draw input box
+    input_box.draw(screen)
+    
+    # Draw label for input box
+    label = render_text("Grid Size:", 30, BLACK)
+    screen.blit(label, (input_box.rect.x, input_box.rect.y - 30))
+
+    # Display mode on the right panel
+    if searching:
+        mode_text = "Searching..."
+    else:
+        mode_text = "AI Solving..." if solving else "Manual Mode"
+    text_surface = render_text(mode_text, 36, BLUE)
+    text_rect = text_surface.get_rect(center=(puzzle_width + CONTROLS_WIDTH//2, 50))
+    screen.blit(text_surface, text_rect)
+
+    # Display search progress or the reason a search stopped at the bottom of the panel
+    for i, line in enumerate(status_lines):
+        text_surface = render_text(line, 24, BLACK)
+        y = puzzle_width - 20 * (len(status_lines) - i) - 5
+        screen.blit(text_surface, text_surface.get_rect(midtop=(puzzle_width + CONTROLS_WIDTH//2, y)))
+
+    # Display search statistics over the top of the panel (toggled with I)
+    if stats_lines:
+        overlay = pygame.Surface((CONTROLS_WIDTH - 10, 18 * len(stats_lines) + 8))
+        overlay.set_alpha(220)
+        overlay.fill(WHITE)
+        screen.blit(overlay, (puzzle_width + 5, 75))
+        for i, line in enumerate(stats_lines):
+            screen.blit(render_text(line, 20, BLACK), (puzzle_width + 10, 80 + 18 * i))
+
+    # Display congratulations message if solved
+    if solved:
+        congrats_text = render_text("Congratulations!", 60, YELLOW)
+        text_rect = congrats_text.get_rect(center=(puzzle_width//2, puzzle_width//2))
+        # Create a semi-transparent background for the text
+        s = pygame.Surface((text_rect.width + 20, text_rect.height + 20))
+        s.set_alpha(200)
+        s.fill(BLACK)
+        screen.blit(s, (text_rect.x - 10, text_rect.y - 10))
+        screen.blit(congrats_text, text_rect)
+
+    # Display the average time spent drawing a frame (toggled with F)
+    if frame_time is not None:
+        screen.blit(render_text(f"{frame_time * 1000:.1f} ms/frame", 20, DARK_GRAY), (puzzle_width + 6, 4))
+
+    pygame.display.flip()
+
+
+def progress_lines(job):
+    """Status text for a running search"""
+    stats = job.stats
+    lines = [f"Nodes: {stats.expanded:,}"]
+    if job.best is not None:
+        lines.append(f"Best: {len(job.best)} moves  {stats.elapsed:.0f}s")
+    elif stats.bound is not None:
+        lines.append(f"f-bound: {stats.bound:g}  {stats.elapsed:.0f}s")
+    return lines
+
+
+def stats_lines(stats):
+    """Overlay text for the statistics of a running or finished search"""
+    if stats is None:
+        return ["No search yet"]
+    elapsed = stats.elapsed
+    lines = [f"Expanded: {stats.expanded:,}",
+             f"Generated: {stats.generated:,}",
+             f"Duplicates: {stats.duplicates:,}",
+             f"Peak open: {stats.peak_frontier:,}",
+             f"Peak closed: {stats.peak_closed:,}",
+             f"Time: {elapsed:.2f}s"]
+    if elapsed > 0:
+        lines.append(f"Nodes/s: {stats.expanded / elapsed:,.0f}")
+    for phase, seconds in (stats.timings or {}).items():
+        lines.append(f"  {phase}: {seconds:.2f}s")
+    return lines
+
+
+def export_stats(job, solver):
+    """Save the statistics of a finished search as JSON in STATS_DIR"""
+    path = os.path.join(STATS_DIR, time.strftime("solve-%Y%m%d-%H%M%S.json"))
+    try:
+        job.stats.save_json(path, board=job.board, grid_size=job.grid_size, solver=solver,
+                            length=len(job.best) if job.best is not None else None, error=job.error)
+    except OSError as e:
+        print(f"Could not save search statistics ({e})")
+
+
+def speed_label(speed):
+    return "Speed: instant" if speed is None else f"Speed: {speed} moves/s"
+
+
+def solve_label(solver, bound):
+    """Text of the Solve button"""
+    return f"Solve ({bound:g}x)" if solver == "Fast" else f"Solve ({solver})"
+
+
+def main():
+    global screen
+    # Initial game state
+    grid_size = INITIAL_GRID_SIZE
+    tile_size = TILE_SIZE
+    puzzle_width = grid_size * tile_size
+    height = puzzle_width
+    
+    solver = SOLVER_NAMES[0]
+    bound = FAST_BOUNDS[1]
+
+    # Open the window only now, so importing this module has no side effects
+    pygame.init()
+    screen = pygame.display.set_mode((puzzle_width + CONTROLS_WIDTH, height))
+    pygame.display.set_caption("N-Puzzle Game with A* Solver")
+
+    # Load and split image
+    tiles = load_and_split_image(IMAGE_PATH, grid_size, tile_size)
+    board = Board(create_solvable_board(grid_size), grid_size)
+
+    # Create buttons - all positioned in the right panel
+    control_center_x = puzzle_width + CONTROLS_WIDTH // 2
+    
+    # Direction buttons
+    up_button = Button(control_center_x - 30, height//2 - 90, 60, 40, "Up", GRAY, DARK_GRAY)
+    down_button = Button(control_center_x - 30, height//2 + 10, 60, 40, "Down", GRAY, DARK_GRAY)
+    left_button = Button(control_center_x - 70, height//2 - 40, 60, 40, "Left", GRAY, DARK_GRAY)
+    right_button = Button(control_center_x + 10, height//2 - 40, 60, 40, "Right", GRAY, DARK_GRAY)
+    
+    # Action buttons
+    solve_button = Button(control_center_x - 80, height//2 + 80, 160, 40, solve_label(solver, bound), GREEN, (100, 255, 100))
+    reset_button = Button(control_center_x - 95, height//2 + 140, 90, 40, "Reset", RED, (255, 100, 100))
+    cancel_button = Button(control_center_x + 5, height//2 + 140, 90, 40, "Cancel", YELLOW, (255, 255, 150))
+    
+    # Input box for grid size
+    input_box = InputBox(control_center_x - 30, height//2 - 150, 60, 32, str(grid_size))
+    
+    # All buttons
+    buttons = [up_button, down_button, left_button, right_button, solve_button, reset_button, cancel_button]
+
+    solving = False
+    solution_path = None
+    current_step = 0
+    solved = False
+    job = None  # Search running in the background
+    seen_solutions = 0  # Solutions of the job already taken over
+    played = []  # Moves played since the job started, to splice in better solutions
+    status_lines = []
+    frame_timer = FrameTimer()
+    show_frame_time = False
+    show_stats = False  # Statistics overlay, also profiles and exports every solve
+    last_stats = None  # Statistics of the latest search
+    job_solver = None  # Solver of the running job, for the export
+    speed = PLAYBACK_SPEEDS[1]
+    sliding = True  # Slide tiles smoothly during playback (toggled with V)
+    step_start = 0  # When the move being played started
+
+    draw_board(board, tiles, buttons, input_box, grid_size, tile_size, solving, None, solved)
+
+    running = True
+    clock = pygame.time.Clock()
+    
+    while running:
+        # Sleep until something happens unless tiles are moving or a search
+        # reports progress; clock.tick below paces those frames
+        if solving or job is not None:
+            events = pygame.event.get()
+        else:
+            events = [pygame.event.wait()] + pygame.event.get()
+
+        mouse_pos = pygame.mouse.get_pos()
+        
+        # Update button hover states
+        for button in buttons:
+            button.update(mouse_pos)
+        
+        for event in events:
+            if event.type == pygame.QUIT:
+                running = False
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_s and not input_box.active:
+                speed = PLAYBACK_SPEEDS[(PLAYBACK_SPEEDS.index(speed) + 1) % len(PLAYBACK_SPEEDS)]
+                step_start = time.perf_counter()
+                if job is None:
+                    status_lines = [speed_label(speed)]
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_v and not input_box.active:
+                sliding = not sliding
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_f and not input_box.active:
+                show_frame_time = not show_frame_time
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_i and not input_box.active:
+                show_stats = not show_stats
+            if (event.type == pygame.KEYDOWN and event.key == pygame.K_w and not input_box.active
+                    and solver == "Fast" and job is None):
+                bound = FAST_BOUNDS[(FAST_BOUNDS.index(bound) + 1) % len(FAST_BOUNDS)]
+                solve_button.text = solve_label(solver, bound)
+
+            # Handle input box events
+            new_grid_size = input_box.handle_event(event)
+            if new_grid_size is not None:
+                try:
+                    new_size = int(new_grid_size)
+                    if 2 <= new_size <= 6:  # Reasonable limits for puzzle size
+                        if new_size != grid_size:
+                            # Change grid size
+                            grid_size = new_size
+                            tile_size = min(150, MAX_PUZZLE_WIDTH // grid_size)  # Adjust tile size to fit
+                            puzzle_width = grid_size * tile_size
+                            height = puzzle_width
+                            
+                            # Resize screen
+                            screen = pygame.display.set_mode((puzzle_width + CONTROLS_WIDTH, height))
+                            
+                            # Optimal search is hopeless on large boards
+                            if grid_size >= 5:
+                                solver = "Fast"
+
+                            # Recreate buttons with new positions
+                            control_center_x = puzzle_width + CONTROLS_WIDTH // 2
+                            up_button = Button(control_center_x - 30, height//2 - 90, 60, 40, "Up", GRAY, DARK_GRAY)
+                            down_button = Button(control_center_x - 30, height//2 + 10, 60, 40, "Down", GRAY, DARK_GRAY)
+                            left_button = Button(control_center_x - 70, height//2 - 40, 60, 40, "Left", GRAY, DARK_GRAY)
+                            right_button = Button(control_center_x + 10, height//2 - 40, 60, 40, "Right", GRAY, DARK_GRAY)
+                            solve_button = Button(control_center_x - 80, height//2 + 80, 160, 40, solve_label(solver, bound), GREEN, (100, 255, 100))
+                            reset_button = Button(control_center_x - 95, height//2 + 140, 90, 40, "Reset", RED, (255, 100, 100))
+                            cancel_button = Button(control_center_x + 5, height//2 + 140, 90, 40, "Cancel", YELLOW, (255, 255, 150))
+                            input_box = InputBox(control_center_x - 30, height//2 - 150, 60, 32, str(grid_size))
+                            buttons = [up_button, down_button, left_button, right_button, solve_button, reset_button, cancel_button]
+                            
+                            # Reload tiles and create new board
+                            tiles = load_and_split_image(IMAGE_PATH, grid_size, tile_size)
+                            board = Board(create_solvable_board(grid_size), grid_size)
+                            solving = False
+                            solution_path = None
+                            current_step = 0
+                            solved = False
+                            if job is not None:
+                                job.cancel()
+                                job = None
+                            status_lines = []
+                except ValueError:
+                    pass  # Invalid input
+
+            if job is not None:
+                # While searching only Reset and Cancel do anything
+                reset = ((event.type == pygame.KEYDOWN and event.key == pygame.K_r)
+                         or (event.type == pygame.MOUSEBUTTONDOWN and reset_button.is_hovered(mouse_pos)))
+                if reset or (event.type == pygame.MOUSEBUTTONDOWN and cancel_button.is_hovered(mouse_pos)):
+                    job.cancel()
+                    job = None
+                    solving = False
+                    solution_path = None
+                    current_step = 0
+                    status_lines = ["Cancelled"]
+                    if reset:
+                        board = Board(create_solvable_board(grid_size), grid_size)
+                        status_lines = []
+                continue
+
+            if solving:
+                reset = ((event.type == pygame.KEYDOWN and event.key == pygame.K_r)
+                         or (event.type == pygame.MOUSEBUTTONDOWN and reset_button.is_hovered(mouse_pos)))
+                if reset or (event.type == pygame.MOUSEBUTTONDOWN and cancel_button.is_hovered(mouse_pos)):
+                    # Stop the AI playback where it is
+                    solving = False
+                    solution_path = None
+                    current_step = 0
+                    if reset:
+                        board = Board(create_solvable_board(grid_size), grid_size)
+                        status_lines = []
+                    continue
+
+            if not solving and not solved:
+                if event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_r:
+                        # Reset board
+                        board = Board(create_solvable_board(grid_size), grid_size)
+                        solving = False
+                        solution_path = None
+                        current_step = 0
+                        solved = False
+                        status_lines = []
+                    elif event.key == pygame.K_UP:
+                        move_tile(board, "up", grid_size)
+                        solved = is_solved(board, grid_size)
+                    elif event.key == pygame.K_DOWN:
+                        move_tile(board, "down", grid_size)  
+                        solved = is_solved(board, grid_size)
+                    elif event.key == pygame.K_LEFT:
+                        move_tile(board, "left", grid_size)
+                        solved = is_solved(board, grid_size)
+                    elif event.key == pygame.K_RIGHT:
+                        move_tile(board, "right", grid_size)
+                        solved = is_solved(board, grid_size)
+                
+                if event.type == pygame.MOUSEBUTTONDOWN:
+                    if up_button.is_hovered(mouse_pos):
+                        move_tile(board, "up", grid_size)
+                        solved = is_solved(board, grid_size)
+                    elif down_button.is_hovered(mouse_pos):
+                        move_tile(board, "down", grid_size)  
+                        solved = is_solved(board, grid_size)
+                    elif left_button.is_hovered(mouse_pos):
+                        move_tile(board, "left", grid_size)
+                        solved = is_solved(board, grid_size)
+                    elif right_button.is_hovered(mouse_pos):
+                        move_tile(board, "right", grid_size)
+                        solved = is_solved(board, grid_size)
+                    elif solve_button.is_hovered(mouse_pos) and event.button == 3:
+                        # Right click cycles through the available solvers
+                        solver = SOLVER_NAMES[(SOLVER_NAMES.index(solver) + 1) % len(SOLVER_NAMES)]
+                        solve_button.text = solve_label(solver, bound)
+                        status_lines = ["W changes the bound"] if solver == "Fast" else []
+                    elif solve_button.is_hovered(mouse_pos):
+                        # Start AI solver in the background so the window keeps responding
+                        job = BackgroundSolver(
+                            lambda b, n, stats, found, solver=solver, bound=bound:
+                                solve(b, n, solver, stats, bound, found, default_cache()),
+                            board, grid_size, SOLVE_TIME_LIMIT, SOLVE_MEMORY_LIMIT, profile=show_stats,
+                        ).start()
+                        last_stats = job.stats
+                        job_solver = solver
+                        seen_solutions = 0
+                        played = []
+                        status_lines = []
+                    elif reset_button.is_hovered(mouse_pos):
+                        # Reset board
+                        board = Board(create_solvable_board(grid_size), grid_size)
+                        solving = False
+                        solution_path = None
+                        current_step = 0
+                        solved = False
+                        status_lines = []
+
+        # Update input box
+        input_box.update()
+
+        # Play the first solution as soon as there is one and switch to a
+        # shorter one whenever the search improves on it
+        if job is not None:
+            done = job.done
+            if job.solutions != seen_solutions and not solved:
+                seen_solutions = job.solutions
+                if not solving:
+                    solution_path = job.best
+                    solving = bool(solution_path)
+                    current_step = 0
+                    step_start = time.perf_counter()
+                else:
+                    remaining = splice_path(played, job.best, grid_size)
+                    if len(remaining) < len(solution_path) - current_step:
+                        solution_path = remaining
+                        current_step = 0
+            if done:
+                status_lines = [job.error] if job.error else []
+                if show_stats:
+                    export_stats(job, job_solver)
+                job = None
+            else:
+                status_lines = progress_lines(job)
+
+        # Play the moves whose time has come; at speed None all of them at once
+        current_move = None
+        slide = None
+        if solving and solution_path and not solved:
+            now = time.perf_counter()
+            duration = 0 if speed is None else 1 / speed
+            while current_step < len(solution_path) and not solved and now - step_start >= duration:
+                direction, moved_tile = solution_path[current_step]
+                move_tile(board, direction, grid_size)
+                played.append((direction, moved_tile))
+                solved = is_solved(board, grid_size)
+                current_step += 1
+                # Later moves keep to the schedule even if a frame came late
+                step_start = now if speed is None else step_start + duration
+            if current_step == len(solution_path) or solved:
+                solving = False
+                if job is not None:
+                    # Nothing left to improve on
+                    job.cancel()
+                    job = None
+                    status_lines = []
+                if solved:
+                    print("AI has solved the puzzle!")
+            else:
+                current_move = solution_path[current_step][1]
+                if sliding:
+                    slide = (current_move, board.index(-1), (now - step_start) / duration)
+
+        frame_start = time.perf_counter()
+        draw_board(board, tiles, buttons, input_box, grid_size, tile_size, solving, current_move, solved,
+                   searching=job is not None and not solving, status_lines=status_lines,
+                   frame_time=frame_timer.average if show_frame_time else None,
+                   stats_lines=stats_lines(last_stats) if show_stats else (), slide=slide)
+        frame_timer.add(time.perf_counter() - frame_start)
+
+        if solving:
+            clock.tick(ANIMATION_FPS)
+        elif job is not None:
+            clock.tick(SEARCH_FPS)
+
+    pygame.quit()
+    sys.exit()
+
+
+if __name__ == "__main__":
+    main()